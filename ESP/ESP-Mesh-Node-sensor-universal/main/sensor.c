@@ -23,7 +23,11 @@ static uint8_t ina260_addr = 0; // Auto-detected at runtime
 #define INA260_REG_CONFIG 0x00
 #define INA260_REG_CURRENT 0x01
 #define INA260_REG_VOLTAGE 0x02
+#define INA260_REG_MASK_ENABLE 0x06
 #define INA260_CONFIG 0x6727 // 1024-sample averaging
+#define INA260_CVRF 0x0008   // Mask/Enable: conversion ready flag
+#define INA260_READY_POLL_MS 10 // One tick at the default 100 Hz FreeRTOS rate
+#define INA260_READY_POLLS 30   // Give up after ~300 ms
 
 static bool ina260_ok = false; // Set true if INA260 found on I2C
 
@@ -53,6 +57,26 @@ void i2c_scan(void) {
   }
 }
 
+// Read a 16-bit INA260 register (big-endian).
+static esp_err_t ina260_read_reg(uint8_t reg, uint16_t *out) {
+  uint8_t data[2] = {0};
+
+  i2c_cmd_handle_t cmd = i2c_cmd_link_create();
+  i2c_master_start(cmd);
+  i2c_master_write_byte(cmd, (ina260_addr << 1) | I2C_MASTER_WRITE, true);
+  i2c_master_write_byte(cmd, reg, true);
+  i2c_master_start(cmd); // Repeated start
+  i2c_master_write_byte(cmd, (ina260_addr << 1) | I2C_MASTER_READ, true);
+  i2c_master_read(cmd, data, 2, I2C_MASTER_LAST_NACK);
+  i2c_master_stop(cmd);
+  esp_err_t ret = i2c_master_cmd_begin(I2C_PORT, cmd, pdMS_TO_TICKS(100));
+  i2c_cmd_link_delete(cmd);
+
+  if (ret == ESP_OK)
+    *out = (data[0] << 8) | data[1];
+  return ret;
+}
+
 esp_err_t sensor_init(void) {
   // Initialize I2C master
   i2c_config_t conf = {
@@ -102,7 +126,16 @@ esp_err_t sensor_init(void) {
     i2c_master_cmd_begin(I2C_PORT, cmd, pdMS_TO_TICKS(100));
     i2c_cmd_link_delete(cmd);
 
-    vTaskDelay(pdMS_TO_TICKS(200)); // Let config settle
+    // Wait for the first averaged conversion instead of a blind delay.
+    // Bounded so a sensor that never raises CVRF can't stall boot.
+    uint16_t mask = 0;
+    for (int i = 0; i < INA260_READY_POLLS; i++) {
+      if (ina260_read_reg(INA260_REG_MASK_ENABLE, &mask) == ESP_OK &&
+          (mask & INA260_CVRF)) {
+        break;
+      }
+      vTaskDelay(pdMS_TO_TICKS(INA260_READY_POLL_MS));
+    }
     ESP_LOGI(TAG, "INA260 configured (1024-sample averaging)");
   } else {
     ESP_LOGE(TAG, "INA260 NOT FOUND in range 0x%02x-0x%02x! Check wiring.",
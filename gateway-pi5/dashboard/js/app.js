@@ -131,22 +131,17 @@ function connectWebSocket() {
 function handleMessage(msg) {
     if (msg.type === 'state') {
         handleState(msg.data);
+    } else if (msg.type === 'sensor_batch') {
+        // One tick of readings from the gateway; redraw the graph once
+        msg.readings.forEach(applySensorReading);
+        topology.updateGraph(nodes.getAllNodes(), currentGatewayNode);
     } else if (msg.type === 'sensor_data') {
-        nodes.updateNode(msg.node_id, msg.data);
-        charts.addPoint(msg.node_id, msg.timestamp, {
-            power: msg.data.power,
-            voltage: msg.data.voltage,
-            current: msg.data.current,
-        });
-        const allNodes = nodes.getAllNodes();
-        topology.updateGraph(allNodes, currentGatewayNode);
-
-        // Show in console if this is a user-triggered response
-        if (msg.user_triggered) {
-            const d = msg.data;
-            const line = `NODE${msg.node_id} >> D:${d.duty}%, V:${d.voltage.toFixed(3)}V, I:${d.current.toFixed(1)}mA, P:${d.power.toFixed(1)}mW`;
-            consoleLog.appendLog(line, msg.timestamp);
-        }
+        applySensorReading(msg);
+        topology.updateGraph(nodes.getAllNodes(), currentGatewayNode);
+    } else if (msg.type === 'nodes_delta') {
+        // Only the fields that changed since the last delta; merge them in
+        Object.entries(msg.nodes).forEach(([id, data]) => nodes.updateNode(id, data));
+        topology.updateGraph(nodes.getAllNodes(), currentGatewayNode);
     } else if (msg.type === 'log') {
         consoleLog.appendLog(msg.text, msg.timestamp);
     } else if (msg.type === 'event') {
@@ -160,6 +155,22 @@ function handleMessage(msg) {
     }
 }
 
+function applySensorReading(r) {
+    nodes.updateNode(r.node_id, r.data);
+    charts.addPoint(r.node_id, r.timestamp, {
+        power: r.data.power,
+        voltage: r.data.voltage,
+        current: r.data.current,
+    });
+
+    // Show in console if this is a user-triggered response
+    if (r.user_triggered) {
+        const d = r.data;
+        const line = `NODE${r.node_id} >> D:${d.duty}%, V:${d.voltage.toFixed(3)}V, I:${d.current.toFixed(1)}mA, P:${d.power.toFixed(1)}mW`;
+        consoleLog.appendLog(line, r.timestamp);
+    }
+}
+
 function handleState(state) {
     if (!state || state.error) return;
 
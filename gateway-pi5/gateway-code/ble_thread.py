@@ -11,6 +11,14 @@ import threading
 import traceback
 from typing import Optional
 
+# uvloop (pulled in by uvicorn[standard]) is a faster drop-in event loop;
+# fall back to the stock asyncio loop where it isn't installed.
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
 
 class BleThread:
     """Dedicated thread with a persistent asyncio event loop for bleak BLE operations."""
@@ -19,12 +27,23 @@ class BleThread:
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread: Optional[threading.Thread] = None
 
+    @classmethod
+    def attach_running_loop(cls) -> 'BleThread':
+        """Wrap the caller's running loop instead of spawning a thread.
+
+        For code that is already async-native (web-only mode): submit*
+        schedule onto that loop, and stop() leaves it running.
+        """
+        bt = cls()
+        bt._loop = asyncio.get_running_loop()
+        return bt
+
     def start(self):
         """Spawn the daemon thread and block until its loop is running."""
         ready = threading.Event()
 
         def _run():
-            self._loop = asyncio.new_event_loop()
+            self._loop = _new_event_loop()
             asyncio.set_event_loop(self._loop)
             self._loop.set_exception_handler(self._exception_handler)
             ready.set()
@@ -42,19 +61,43 @@ class BleThread:
             raise RuntimeError("BleThread not started")
         return asyncio.run_coroutine_threadsafe(coro, self._loop)
 
+    def submit_nowait(self, coro) -> None:
+        """Schedule a fire-and-forget coroutine on the BLE loop.
+
+        No Future is created; exceptions go to the loop's exception handler.
+        Raises RuntimeError, like submit(), when the loop isn't running (the
+        coroutine is closed first so it isn't reported as never awaited).
+        """
+        loop = self._loop
+        if loop is None:
+            coro.close()
+            raise RuntimeError("BleThread not started")
+        try:
+            loop.call_soon_threadsafe(asyncio.ensure_future, coro)
+        except RuntimeError:  # Loop closed under us during shutdown
+            coro.close()
+            raise
+
     async def submit_async(self, coro):
         """Submit a coroutine and await its result from another async context."""
         future = self.submit(coro)
         return await asyncio.wrap_future(future)
 
-    def stop(self):
-        """Stop the event loop and join the thread."""
-        if self._loop and self._loop.is_running():
-            self._loop.call_soon_threadsafe(self._loop.stop)
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Stop the event loop and join the thread (if we own one).
+
+        Waits at most `timeout` seconds; returns False if the thread was
+        still running then (it is a daemon, so it won't block exit).
+        """
+        stopped = True
         if self._thread:
-            self._thread.join(timeout=5.0)
+            if self._loop and self._loop.is_running():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=timeout)
+            stopped = not self._thread.is_alive()
         self._loop = None
         self._thread = None
+        return stopped
 
     def _exception_handler(self, loop, context):
         msg = context.get("message", "Unhandled exception in BLE thread")
@@ -6,13 +6,83 @@ import re
 DC_MONITOR_SERVICE_UUID = "0000dc01-0000-1000-8000-00805f9b34fb"
 SENSOR_DATA_CHAR_UUID = "0000dc02-0000-1000-8000-00805f9b34fb"
 COMMAND_CHAR_UUID = "0000dc03-0000-1000-8000-00805f9b34fb"
+# Lowercase form for comparing against advertised UUID strings
+DC_MONITOR_SERVICE_UUID_LC = DC_MONITOR_SERVICE_UUID.lower()
+
+# Services a gateway may advertise, used as the OS-level scan filter:
+# DC01 (custom GATT advert), plus the BLE Mesh Provisioning (0x1827)
+# and Proxy (0x1828) services for "ESP-BLE-MESH" adverts
+SCAN_SERVICE_UUIDS = [
+    DC_MONITOR_SERVICE_UUID,
+    "00001827-0000-1000-8000-00805f9b34fb",
+    "00001828-0000-1000-8000-00805f9b34fb",
+]
 
 # Device name prefixes to look for
 # Before provisioning: "Mesh-Gateway" (custom GATT advert)
 # After provisioning: "ESP-BLE-MESH" (mesh GATT proxy advert)
 # Universal node (v0.7.0): "DC-Monitor" (sensor + gateway node)
-DEVICE_NAME_PREFIXES = ["Mesh-Gateway", "DC-Monitor", "ESP-BLE-MESH"]
+# A tuple so callers can test with one name.startswith(DEVICE_NAME_PREFIXES)
+DEVICE_NAME_PREFIXES = ("Mesh-Gateway", "DC-Monitor", "ESP-BLE-MESH")
 
 # Sensor data parsing regex (case-insensitive for mA/mW/MA/MW)
 SENSOR_RE = re.compile(r'D:(\d+)%,V:([\d.]+)V,I:([\d.]+)mA,P:([\d.]+)mW', re.IGNORECASE)
 NODE_ID_RE = re.compile(r'NODE(\d+)', re.IGNORECASE)
+# Whole vendor response line, matched on raw notification bytes:
+# NODE<id>:DATA:D:<duty>%,V:<volts>V,I:<mA>mA,P:<mW>mW
+DATA_LINE_RE = re.compile(
+    rb'NODE(\d+):DATA:D:(\d+)%,V:([\d.]+)V,I:([\d.]+)mA,P:([\d.]+)mW', re.IGNORECASE)
+
+
+def parse_data_line(raw: bytes):
+    """Parse a raw 'NODE<id>:DATA:D:..' notification -> (node_id, duty, V, mA, mW).
+
+    Works on the undecoded bytes; returns None when raw isn't a well-formed
+    sensor line so the caller can fall back to the generic decode path.
+    """
+    m = DATA_LINE_RE.match(raw)
+    if m is None:
+        return None
+    node_id, duty, voltage, current, power = m.groups()
+    try:
+        return node_id.decode(), int(duty), float(voltage), float(current), float(power)
+    except ValueError:
+        return None  # e.g. "1.2.3" matched [\d.]+
+
+
+def parse_node_id(tag: str):
+    """Return the node ID digits from a tag like 'NODE3', or None.
+
+    Plain prefix check for the usual exact tag; NODE_ID_RE handles the rest.
+    """
+    digits = tag[4:]
+    if tag[:4].upper() == 'NODE' and digits.isdigit():
+        return digits
+    m = NODE_ID_RE.match(tag)
+    return m.group(1) if m else None
+
+
+def parse_sensor(payload: str):
+    """Parse 'D:50%,V:12.003V,I:250.00mA,P:3000.8mW' -> (duty, V, mA, mW).
+
+    Splits on the fixed firmware format without touching the regex engine;
+    anything that doesn't fit falls back to SENSOR_RE. Returns None if the
+    payload isn't a sensor reading.
+    """
+    parts = payload.upper().split(',')
+    if len(parts) == 4:
+        d, v, i, p = parts
+        if (d[:2] == 'D:' and d[-1:] == '%' and v[:2] == 'V:' and v[-1:] == 'V'
+                and i[:2] == 'I:' and i[-2:] == 'MA'
+                and p[:2] == 'P:' and p[-2:] == 'MW'):
+            try:
+                return int(d[2:-1]), float(v[2:-1]), float(i[2:-2]), float(p[2:-2])
+            except ValueError:
+                pass
+    m = SENSOR_RE.match(payload)
+    if not m:
+        return None
+    try:
+        return int(m.group(1)), float(m.group(2)), float(m.group(3)), float(m.group(4))
+    except ValueError:
+        return None
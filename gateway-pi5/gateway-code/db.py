@@ -3,92 +3,320 @@
 Uses WAL mode for concurrent reads from the web server while the gateway
 writes sensor data. All functions are synchronous (called from asyncio
 via run_in_executor when needed).
+
+Each thread keeps one open connection (see get_connection) so the
+per-reading insert path doesn't pay for connect + PRAGMA every call.
+Sensor inserts are queued and written in batches by a background
+writer thread (one transaction per batch); call flush() on shutdown.
+Readings are partitioned into one table per UTC day, so purging old
+history drops whole tables.
 """
 
+import functools
+import queue
 import sqlite3
+import threading
 import time
 from pathlib import Path
+from typing import Optional
 
 DB_PATH = Path(__file__).parent / "mesh_data.db"
 
+INSERT_BATCH_MAX = 200     # Max rows per write transaction
+INSERT_BATCH_WAIT = 0.2    # Seconds to wait for more rows before committing
+
+# Columns returned by get_history (all present in the covering indexes)
+HISTORY_COLUMNS = ("timestamp", "node_id", "duty", "voltage",
+                   "current_ma", "power_mw", "commanded_duty")
+_HISTORY_COLS_SQL = ", ".join(HISTORY_COLUMNS)
+
+# Readings live in one table per UTC day (r_YYYYMMDD) so retention is a
+# DROP TABLE instead of a row-by-row DELETE. A sensor_readings VIEW over all
+# day tables is kept for ad-hoc queries. Statement templates are built once;
+# equal SQL text hits the connection's prepared-statement cache.
+_DAY_PREFIX = "r_"
+_DAY_TABLE_DDL = (
+    "CREATE TABLE IF NOT EXISTS {t} ("
+    "timestamp REAL NOT NULL, node_id TEXT NOT NULL, duty INTEGER, "
+    "voltage REAL, current_ma REAL, power_mw REAL, commanded_duty INTEGER)"
+)
+# Covering indexes: get_history is served from the index alone
+_DAY_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS {t}_node ON {t}(node_id, timestamp, duty, "
+    "voltage, current_ma, power_mw, commanded_duty)",
+    "CREATE INDEX IF NOT EXISTS {t}_time ON {t}(timestamp, node_id, duty, "
+    "voltage, current_ma, power_mw, commanded_duty)",
+)
+_INSERT_SQL = (
+    "INSERT INTO {t} "
+    "(timestamp, node_id, duty, voltage, current_ma, power_mw, commanded_duty) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_HISTORY_NODE_SELECT = (
+    "SELECT " + _HISTORY_COLS_SQL + " FROM {t} "
+    "WHERE node_id = ? AND timestamp > ?"
+)
+_HISTORY_ALL_SELECT = "SELECT " + _HISTORY_COLS_SQL + " FROM {t} WHERE timestamp > ?"
+_HISTORY_TAIL = " ORDER BY timestamp DESC LIMIT ?"
+
+_day_tables: frozenset = frozenset()  # Existing day tables (replaced, never mutated)
+_schema_lock = threading.Lock()       # Serializes day-table create/drop + view rebuild
+
+_local = threading.local()  # Per-thread cached connection
+_write_q: queue.SimpleQueue = queue.SimpleQueue()  # Row tuples, row lists or flush Events
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _print_log(text: str):
+    print(f"  {text}")
+
+
+_log = _print_log  # Writer-thread error output (see set_logger)
+
 
 def get_connection() -> sqlite3.Connection:
-    """Get a database connection with WAL mode and row factory."""
-    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.row_factory = sqlite3.Row
+    """Get this thread's database connection (WAL mode, row factory).
+
+    The connection is opened once per thread and reused; callers must
+    not close it.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False,
+                               cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")   # 256 MB memory-mapped reads
+        conn.execute("PRAGMA cache_size=-65536")     # 64 MB page cache (grows on demand)
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.row_factory = sqlite3.Row
+        _local.conn = conn
     return conn
 
 
 def init_db():
-    """Create tables if they don't exist."""
+    """Create tables if they don't exist and load the list of day tables.
+
+    A pre-partitioning sensor_readings table is migrated into day tables.
+    """
+    global _day_tables
     conn = get_connection()
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS sensor_readings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp REAL NOT NULL,
-            node_id TEXT NOT NULL,
-            duty INTEGER,
-            voltage REAL,
-            current_ma REAL,
-            power_mw REAL,
-            commanded_duty INTEGER
-        );
-        CREATE INDEX IF NOT EXISTS idx_readings_node_time
-            ON sensor_readings(node_id, timestamp);
-
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        );
-    """)
-    conn.commit()
-    conn.close()
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+    with _schema_lock:
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'sensor_readings'").fetchone()
+        if legacy:
+            _migrate_legacy_table(conn)
+        tables = frozenset(r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name GLOB 'r_[0-9]*'"))
+        _rebuild_view(conn, tables)
+        conn.commit()
+        _day_tables = tables
+
+
+@functools.lru_cache(maxsize=64)
+def _table_for_day(day: int) -> str:
+    """Day table name for a day number (days since the Unix epoch, UTC)."""
+    return _DAY_PREFIX + time.strftime("%Y%m%d", time.gmtime(day * 86400))
+
+
+def _day_table(ts: float) -> str:
+    """Day table name holding a Unix timestamp."""
+    return _table_for_day(int(ts // 86400))
+
+
+def _create_day_table(conn: sqlite3.Connection, name: str):
+    conn.execute(_DAY_TABLE_DDL.format(t=name))
+    for ddl in _DAY_INDEX_DDL:
+        conn.execute(ddl.format(t=name))
+
+
+def _ensure_day_table(conn: sqlite3.Connection, name: str):
+    """Create a day table (and refresh the view) the first time it's needed."""
+    global _day_tables
+    if name in _day_tables:
+        return
+    with _schema_lock:
+        if name in _day_tables:
+            return
+        _create_day_table(conn, name)
+        tables = _day_tables | {name}
+        _rebuild_view(conn, tables)
+        conn.commit()
+        _day_tables = tables
+
+
+def _rebuild_view(conn: sqlite3.Connection, tables):
+    """Point the sensor_readings view at the current set of day tables."""
+    conn.execute("DROP VIEW IF EXISTS sensor_readings")
+    if tables:
+        body = " UNION ALL ".join(
+            f"SELECT {_HISTORY_COLS_SQL} FROM {t}" for t in sorted(tables))
+    else:
+        body = "SELECT " + ", ".join(
+            f"NULL AS {c}" for c in HISTORY_COLUMNS) + " WHERE 0"
+    conn.execute("CREATE VIEW sensor_readings AS " + body)
+
+
+def _migrate_legacy_table(conn: sqlite3.Connection):
+    """Move rows from the old single sensor_readings table into day tables."""
+    days = [r[0] for r in conn.execute(
+        "SELECT DISTINCT CAST(timestamp / 86400 AS INTEGER) FROM sensor_readings")]
+    for day in days:
+        name = _table_for_day(day)
+        _create_day_table(conn, name)
+        conn.execute(
+            f"INSERT INTO {name} ({_HISTORY_COLS_SQL}) "
+            f"SELECT {_HISTORY_COLS_SQL} FROM sensor_readings "
+            "WHERE timestamp >= ? AND timestamp < ?",
+            (day * 86400, (day + 1) * 86400))
+    conn.execute("DROP TABLE sensor_readings")
+    print(f"  [DB] Migrated sensor_readings into {len(days)} day table(s)")
+
+
+def set_logger(log):
+    """Route background-writer errors through log(text) instead of print().
+
+    The gateway passes its log() so errors reach the TUI/web console
+    rather than being printed over the Textual screen. log() must be safe
+    to call from the writer thread.
+    """
+    global _log
+    _log = log
 
 
 def insert_reading(node_id: str, duty: int, voltage: float,
                    current_ma: float, power_mw: float,
                    commanded_duty: int = 0):
-    """Insert a sensor reading."""
+    """Queue a sensor reading for the background writer (non-blocking)."""
+    _ensure_writer()
+    _write_q.put((time.time(), node_id, duty, voltage, current_ma,
+                  power_mw, commanded_duty))
+
+
+def insert_many(rows: list):
+    """Queue several readings at once (non-blocking).
+
+    Rows are (timestamp, node_id, duty, voltage, current_ma, power_mw,
+    commanded_duty) tuples.
+    """
+    if rows:
+        _ensure_writer()
+        _write_q.put(rows)
+
+
+def flush(timeout: float = 5.0):
+    """Block until every queued reading has been committed (or timeout)."""
+    if _writer is None or not _writer.is_alive():
+        return
+    done = threading.Event()
+    _write_q.put(done)
+    done.wait(timeout)
+
+
+def _ensure_writer():
+    """Start the background writer thread on first use."""
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, daemon=True,
+                                       name="db-writer")
+            _writer.start()
+
+
+def _writer_loop():
+    """Drain the write queue, committing up to INSERT_BATCH_MAX rows at once.
+
+    A batch closes when it is full, when no new row arrives within
+    INSERT_BATCH_WAIT seconds, or when flush() enqueues a marker Event.
+    """
     conn = get_connection()
-    conn.execute(
-        "INSERT INTO sensor_readings "
-        "(timestamp, node_id, duty, voltage, current_ma, power_mw, commanded_duty) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (time.time(), node_id, duty, voltage, current_ma, power_mw, commanded_duty)
-    )
-    conn.commit()
-    conn.close()
+    while True:
+        item = _write_q.get()
+        rows, waiters = [], []
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+            if isinstance(item, list):
+                rows.extend(item)
+            else:
+                rows.append(item)
+            if len(rows) >= INSERT_BATCH_MAX:
+                break
+            try:
+                item = _write_q.get(timeout=INSERT_BATCH_WAIT)
+            except queue.Empty:
+                break
+        if rows:
+            by_table = {}
+            for row in rows:
+                by_table.setdefault(_day_table(row[0]), []).append(row)
+            try:
+                # Create day tables first: _ensure_day_table commits, and
+                # the whole batch must land (or roll back) as one transaction
+                for name in by_table:
+                    _ensure_day_table(conn, name)
+                for name, batch in by_table.items():
+                    conn.executemany(_INSERT_SQL.format(t=name), batch)
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                _log(f"[DB] Dropped {len(rows)} reading(s): {e}")
+        for w in waiters:
+            w.set()
 
 
 def get_history(node_id: str = None, minutes: int = 30,
-                limit: int = 500) -> list[dict]:
-    """Get historical readings, optionally filtered by node and time window."""
-    conn = get_connection()
-    since = time.time() - (minutes * 60)
+                limit: int = 500) -> dict:
+    """Get historical readings, optionally filtered by node and time window.
+
+    Returns {'cols': HISTORY_COLUMNS, 'rows': [tuple, ...]}, newest first.
+    Use to_dicts() where per-row dicts are needed.
+    """
+    now = time.time()
+    since = now - (minutes * 60)
+    tables = _day_tables
+    names = [t for t in map(_table_for_day,
+                            range(int(since // 86400), int(now // 86400) + 1))
+             if t in tables]
+    if not names:
+        return {"cols": HISTORY_COLUMNS, "rows": []}
     if node_id:
-        rows = conn.execute(
-            "SELECT * FROM sensor_readings "
-            "WHERE node_id = ? AND timestamp > ? "
-            "ORDER BY timestamp DESC LIMIT ?",
-            (node_id, since, limit)
-        ).fetchall()
+        select, args = _HISTORY_NODE_SELECT, (node_id, since)
     else:
-        rows = conn.execute(
-            "SELECT * FROM sensor_readings "
-            "WHERE timestamp > ? "
-            "ORDER BY timestamp DESC LIMIT ?",
-            (since, limit)
-        ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+        select, args = _HISTORY_ALL_SELECT, (since,)
+    sql = " UNION ALL ".join(select.format(t=t) for t in names) + _HISTORY_TAIL
+    cur = get_connection().cursor()
+    cur.row_factory = None  # Plain tuples, not sqlite3.Row
+    rows = cur.execute(sql, args * len(names) + (limit,)).fetchall()
+    return {"cols": HISTORY_COLUMNS, "rows": rows}
+
+
+def to_dicts(result: dict) -> list[dict]:
+    """Expand a get_history() result into a list of per-row dicts."""
+    keys = result["cols"]
+    return [dict(zip(keys, r)) for r in result["rows"]]
 
 
 def purge_old_readings(days: int = 7):
-    """Delete readings older than N days."""
-    conn = get_connection()
-    cutoff = time.time() - (days * 86400)
-    conn.execute("DELETE FROM sensor_readings WHERE timestamp < ?", (cutoff,))
-    conn.commit()
-    conn.close()
+    """Drop day tables that lie entirely before the last N days."""
+    global _day_tables
+    cutoff = _day_table(time.time() - (days * 86400))
+    with _schema_lock:
+        old = [t for t in _day_tables if t < cutoff]
+        if not old:
+            return
+        conn = get_connection()
+        keep = _day_tables.difference(old)
+        _rebuild_view(conn, keep)
+        for name in old:
+            conn.execute(f"DROP TABLE IF EXISTS {name}")
+        conn.commit()
+        _day_tables = keep
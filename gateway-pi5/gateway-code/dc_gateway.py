@@ -5,8 +5,8 @@ and command routing to mesh nodes via the ESP32-C6 GATT gateway.
 """
 
 import asyncio
-import threading
 import time
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
@@ -14,22 +14,86 @@ from bleak import BleakClient, BleakScanner
 from bleak.backends.characteristic import BleakGATTCharacteristic
 
 from constants import (
-    DC_MONITOR_SERVICE_UUID,
+    DC_MONITOR_SERVICE_UUID_LC,
+    SCAN_SERVICE_UUIDS,
     SENSOR_DATA_CHAR_UUID,
     COMMAND_CHAR_UUID,
     DEVICE_NAME_PREFIXES,
-    SENSOR_RE,
-    NODE_ID_RE,
+    parse_data_line,
+    parse_node_id,
+    parse_sensor,
 )
 from power_manager import PowerManager
 
-# Check for textual availability (needed for log routing)
-_HAS_TEXTUAL = False
+# Optional async stdin for the plain CLI (falls back to input() in a thread)
 try:
-    from textual.app import App
-    _HAS_TEXTUAL = True
+    from aioconsole import ainput as _ainput
 except ImportError:
-    pass
+    _ainput = None
+
+READINGS_FLUSH_INTERVAL = 0.25  # Seconds between batched web/DB flushes
+RECONNECT_RETRY_DELAY = 2.0     # Seconds between failed reconnect attempts
+
+
+def _ts() -> str:
+    """Wall-clock HH:MM:SS for log lines, formatted only when a line is emitted."""
+    return datetime.now().strftime("%H:%M:%S")
+
+
+async def scan_for_gateways(timeout=10.0, target_address=None, log=print):
+    """Scan for DC Monitor gateway nodes.
+
+    If target_address is given, skip name/UUID matching and just find that device.
+    Otherwise, match by name prefix or service UUID. Progress lines go to
+    `log`. Needs no DCMonitorGateway, so `gateway.py --scan` can call it
+    directly.
+    """
+    log(f"Scanning for BLE devices ({timeout}s)...")
+
+    # Let the OS drop non-gateway advertisements before they reach
+    # Python. A scan for a specific address stays unfiltered so any
+    # device can be found.
+    if target_address:
+        devices = await BleakScanner.discover(timeout=timeout, return_adv=True)
+    else:
+        devices = await BleakScanner.discover(
+            timeout=timeout, return_adv=True,
+            service_uuids=SCAN_SERVICE_UUIDS)
+
+    target_u = target_address.upper() if target_address else None
+    nodes = []
+    for address, (device, adv_data) in devices.items():
+        # If a specific address was requested, match it directly
+        adv_addr_u = device.address.upper()
+        if target_u and adv_addr_u == target_u:
+            nodes.append(device)
+            log(f"Found target: {device.name or '(no name)'} [{device.address}]")
+            continue
+
+        # Match by known name prefixes
+        if device.name and device.name.startswith(DEVICE_NAME_PREFIXES):
+            nodes.append(device)
+            log(f"Found: {device.name} [{device.address}]")
+        # Match by service UUID (pre-provisioning)
+        elif adv_data.service_uuids and any(
+                str(u).lower() == DC_MONITOR_SERVICE_UUID_LC
+                for u in adv_data.service_uuids):
+            nodes.append(device)
+            log(f"Found: {device.name or 'Unknown'} [{device.address}] (by service UUID)")
+
+    if not nodes:
+        log("No DC Monitor gateways found")
+        log("Tip: Make sure ESP32-C6 is powered and advertising")
+
+    return nodes
+
+
+def find_device(devices, address):
+    """Return the device whose MAC matches `address` (any case), or None."""
+    if not address:
+        return None
+    by_addr = {d.address.upper(): d for d in devices}
+    return by_addr.get(address.upper())
 
 
 class DCMonitorGateway:
@@ -38,20 +102,37 @@ class DCMonitorGateway:
         self.connected_device = None
         self.running = True
         self.target_node = "0"
-        self._chunk_buf = ""  # Buffer for reassembling chunked notifications
+        self._chunk_parts: list[bytes] = []  # Raw pieces of a chunked notification
         self._power_manager = None  # PowerManager instance
         self._monitoring = False  # True when monitor mode is active
-        self.app = None  # Reference to TUI app (set by MeshGatewayApp)
+        self.app = None  # Reference to TUI app (set via attach_app())
+        self._tui_active = False  # True while a TUI app is attached
         self.ble_thread = None  # BleThread instance (set by TUI app)
-        self._node_events: dict[str, threading.Event] = {}  # Signaled when node responds
+        # Signaled when node responds: node_id -> (asyncio.Event, loop owning it)
+        self._node_events: dict[str, tuple[asyncio.Event, asyncio.AbstractEventLoop]] = {}
         self.known_nodes: set[str] = set()  # Node IDs that have actually responded with sensor data
         self.sensing_node_count = 0  # Set from BLE scan: total_mesh_devices - 1 (GATT gateway)
         # Reconnection state (v0.7.0 Phase 1)
         self._was_connected = False
         self._reconnecting = False
         self._last_connected_address = None
-        self._web_enabled = False  # Set True by gateway.py when --web is used
-        self._last_readings = {}  # {node_id: {duty, voltage, current, power, last_seen}}
+        self._disconnected_evt = asyncio.Event()  # Set by bleak's disconnected_callback
+        self._ble_loop = None  # Loop the BleakClient lives on (set in connect_to_node)
+        self._web_enabled = False  # Set True by enable_web() when --web is used
+        self._web = None  # web_server module, cached by enable_web()
+        self._db = None   # db module, cached by enable_web()
+        # Readings awaiting the next web broadcast/DB batch (see _drain_readings)
+        self._pending_readings: deque = deque(maxlen=4096)
+        self._drain_task = None
+        # Raw notifications awaiting _rx_worker (appended by notification_handler)
+        self._rx_q: deque = deque()
+        self._rx_ev = asyncio.Event()
+        self._rx_task = None
+        self._web_sink = lambda reading: None  # Per-reading web hook, bound by enable_web()
+        # Readings awaiting the TUI's next frame (drained by MeshGatewayApp):
+        # (node_id, duty, voltage, current, power, line, is_user_response)
+        self._pending_ui: deque = deque(maxlen=4096)
+        self._last_readings: dict[str, dict] = {}  # {node_id: {duty, voltage, current, power, last_seen}}
         # Web auto-poll state (v0.7.1 Phase 3)
         self._web_poll_task = None
         self._web_poll_interval = 2.0  # seconds (adjustable 0.5–30)
@@ -60,6 +141,33 @@ class DCMonitorGateway:
         self._poll_interrupt = asyncio.Event() # Wakes poll loop for user cmd
         self._pending_user_nodes = set()       # Node IDs awaiting user-triggered response ("*" = ALL)
         self._poll_show_log = False            # When True, poll data also shows in TUI log
+        # Non-data notification prefixes, keyed by first character
+        # (a perfect discriminator): first char -> (prefix, handler(decoded))
+        self._prefix_handlers = {
+            "E": ("ERROR:", self._on_error),
+            "S": ("SENT:", self._on_sent),
+            "M": ("MESH_READY", self._on_mesh_ready),
+            "T": ("TIMEOUT:", self._on_timeout),
+        }
+
+    def enable_web(self):
+        """Turn on web dashboard integration (broadcasts + DB history).
+
+        web_server and db are imported once here so the BLE callback path
+        only touches cached module references.
+        """
+        import db
+        import web_server
+        self._db = db
+        self._web = web_server
+        db.set_logger(lambda text: self.log(text, style="bold red"))
+        self._web_sink = self._pending_readings.append
+        self._web_enabled = True
+
+    def attach_app(self, app):
+        """Attach (or detach, with None) the Textual app used for output."""
+        self.app = app
+        self._tui_active = app is not None
 
     def mark_user_command(self, target_node: str):
         """Mark target nodes as expecting a user-triggered response.
@@ -86,6 +194,10 @@ class DCMonitorGateway:
         else:
             self._pending_user_nodes.add(str(target_node))
 
+    def debug_enabled(self) -> bool:
+        """True when _debug log lines would actually be shown (TUI debug mode)."""
+        return self._tui_active and getattr(self.app, 'debug_mode', False)
+
     def log(self, text: str, style: str = "", _from_thread: bool = False,
             _debug: bool = False):
         """Post a log message to the TUI, or print() if no TUI.
@@ -96,19 +208,17 @@ class DCMonitorGateway:
                          for safe cross-thread posting.
             _debug: If True, only show when debug_mode is on (F2 / 'debug').
         """
-        if _debug:
-            if self.app and _HAS_TEXTUAL:
-                if not getattr(self.app, 'debug_mode', False):
-                    return
-            else:
-                return  # CLI: suppress debug logs
-        if self.app and _HAS_TEXTUAL:
+        if _debug and not self.debug_enabled():
+            return  # Debug off (CLI always suppresses debug logs)
+        app = self.app
+        tui = self._tui_active
+        if tui:
             try:
-                msg = self.app.LogMsg(text, style)
+                msg = app.LogMsg(text, style)
                 if _from_thread:
-                    self.app.call_from_thread(self.app.post_message, msg)
+                    app.call_from_thread(app.post_message, msg)
                 else:
-                    self.app.post_message(msg)
+                    app.post_message(msg)
             except Exception as e:
                 print(f"  {text}  [log error: {e}]")
         else:
@@ -117,52 +227,44 @@ class DCMonitorGateway:
         # Web console streaming (skip debug messages to reduce noise)
         if self._web_enabled and not _debug:
             try:
-                import web_server
-                loop = self.ble_thread._loop if self.ble_thread else None
-                if loop:
-                    asyncio.run_coroutine_threadsafe(
-                        web_server.broadcast_log(text), loop)
+                if self.ble_thread:
+                    self.ble_thread.submit_nowait(self._web.broadcast_log(text))
             except Exception:
                 pass
 
     async def scan_for_nodes(self, timeout=10.0, target_address=None):
-        """Scan for DC Monitor gateway nodes.
-
-        If target_address is given, skip name/UUID matching and just find that device.
-        Otherwise, match by name prefix or service UUID.
-        """
-        self.log(f"Scanning for BLE devices ({timeout}s)...")
-
-        devices = await BleakScanner.discover(timeout=timeout, return_adv=True)
-
-        nodes = []
-        for address, (device, adv_data) in devices.items():
-            # If a specific address was requested, match it directly
-            if target_address and device.address.upper() == target_address.upper():
-                nodes.append(device)
-                self.log(f"Found target: {device.name or '(no name)'} [{device.address}]")
-                continue
+        """Scan for DC Monitor gateway nodes (see scan_for_gateways)."""
+        return await scan_for_gateways(timeout, target_address, self.log)
 
-            # Match by known name prefixes
-            if device.name and any(p in device.name for p in DEVICE_NAME_PREFIXES):
-                nodes.append(device)
-                self.log(f"Found: {device.name} [{device.address}]")
-            # Match by service UUID (pre-provisioning)
-            elif adv_data.service_uuids:
-                if DC_MONITOR_SERVICE_UUID.lower() in [str(u).lower() for u in adv_data.service_uuids]:
-                    nodes.append(device)
-                    self.log(f"Found: {device.name or 'Unknown'} [{device.address}] (by service UUID)")
-
-        if not nodes:
-            self.log("No DC Monitor gateways found")
-            self.log("Tip: Make sure ESP32-C6 is powered and advertising")
+    def notification_handler(self, characteristic: BleakGATTCharacteristic, data: bytearray):
+        """Bleak notification callback: queue the raw bytes for _rx_worker.
 
-        return nodes
+        Bleak calls this on the loop that owns the client (the BLE thread),
+        so the Event can be set directly. Notifications that arrive in the
+        same BLE interval are then handled in one worker pass.
+        """
+        self._rx_q.append(data)
+        self._rx_ev.set()
+
+    async def _rx_worker(self):
+        """Process queued notifications in arrival order, a batch per wake-up."""
+        q = self._rx_q
+        ev = self._rx_ev
+        process = self._process_notification
+        while self.running:
+            await ev.wait()
+            ev.clear()
+            while q:
+                try:
+                    process(q.popleft())
+                except Exception as e:
+                    self.log(f"[RX] Error handling notification: {e}",
+                             style="bold red", _from_thread=True)
 
-    def notification_handler(self, characteristic: BleakGATTCharacteristic, data: bytearray):
-        """Handle incoming notifications from GATT gateway.
+    def _process_notification(self, data: bytearray):
+        """Handle one notification from the GATT gateway.
 
-        IMPORTANT: This runs on bleak's callback thread, NOT the Textual event loop.
+        IMPORTANT: This runs on the BLE thread, NOT the Textual event loop.
         All UI updates must use call_from_thread() or log(_from_thread=True).
 
         Messages > 20 bytes are chunked by the gateway:
@@ -170,130 +272,159 @@ class DCMonitorGateway:
           - Final (or only) chunk has no '+' prefix
         We accumulate '+' chunks and process the full message on the final chunk.
         """
-        decoded = data.decode('utf-8', errors='replace').strip()
-
-        # Chunked reassembly: '+' prefix means more data follows
-        if decoded.startswith('+'):
-            self._chunk_buf += decoded[1:]  # Accumulate without the '+' prefix
+        # Chunked reassembly: '+' prefix means more data follows.
+        # Raw bytes are buffered and decoded once, so a multi-byte UTF-8
+        # sequence split across chunks still decodes correctly.
+        if data[:1] == b'+':
+            # Accumulate without the '+' prefix (one copy, straight from a view)
+            self._chunk_parts.append(memoryview(data)[1:].tobytes())
             return  # Wait for final chunk
 
         # Final (or only) chunk - combine with any buffered data
-        if self._chunk_buf:
-            decoded = self._chunk_buf + decoded
-            self._chunk_buf = ""
+        # (joined immediately, so the final bytearray needs no bytes() copy;
+        # an unchunked message is used as-is and decoded only if needed)
+        if self._chunk_parts:
+            self._chunk_parts.append(data)
+            raw = b"".join(self._chunk_parts)
+            self._chunk_parts.clear()
+        else:
+            raw = data
+
+        # Fast path: a well-formed sensor line is parsed straight from the
+        # raw bytes; only the payload is decoded (for the log line).
+        reading = parse_data_line(raw)
+        if reading is not None:
+            node_id = reading[0]
+            payload = raw[raw.find(b":DATA:") + 6:].decode('utf-8', errors='replace').strip()
+            self._on_reading(*reading, "NODE" + node_id, payload)
+            return
 
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        decoded = raw.decode('utf-8', errors='replace').strip()
+
+        # Status lines: one dict lookup on the first character, then a
+        # single startswith to confirm the prefix
+        entry = self._prefix_handlers.get(decoded[:1])
+        if entry is not None and decoded.startswith(entry[0]):
+            entry[1](decoded)
+            return
 
-        # Parse vendor model responses: NODE<id>:DATA:<sensor payload>
+        # Vendor model responses the fast path couldn't parse:
+        # NODE<id>:DATA:<sensor payload>
         if ":DATA:" in decoded:
-            parts = decoded.split(":DATA:", 1)
-            node_tag = parts[0]  # e.g. "NODE0"
-            payload = parts[1]   # e.g. "D:50%,V:12.345V,I:1234.5MA,P:15234.5MW"
-
-            # Parse sensor values
-            sensor_match = SENSOR_RE.match(payload)
-            node_match = NODE_ID_RE.match(node_tag)
-
-            if sensor_match and node_match:
-                node_id = node_match.group(1)
-                duty = int(sensor_match.group(1))
-                voltage = float(sensor_match.group(2))
-                current = float(sensor_match.group(3))
-                power = float(sensor_match.group(4))
-
-                # Track this node as known (it actually exists and responded)
-                self.known_nodes.add(node_id)
-
-                # Store latest reading for web API (independent of PM)
-                self._last_readings[node_id] = {
-                    "duty": duty, "voltage": voltage,
-                    "current": current, "power": power,
-                    "last_seen": time.time(),
-                }
-
-                # Feed PowerManager
-                if self._power_manager:
-                    self._power_manager.on_sensor_data(
-                        node_id, duty, voltage, current, power)
-
-                # Signal that this node responded (unblocks event-driven pacing)
-                evt = self._node_events.get(node_id)
-                if evt:
-                    evt.set()
-
-                # Determine if this is a user-triggered response
-                is_user_response = False
-                if node_id in self._pending_user_nodes:
-                    self._pending_user_nodes.discard(node_id)
-                    is_user_response = True
-                elif "*" in self._pending_user_nodes:
-                    is_user_response = True
-
-                # Web dashboard: broadcast sensor data + record to DB
-                if self._web_enabled:
-                    try:
-                        import web_server
-                        import db
-                        loop = self.ble_thread._loop if self.ble_thread else None
-                        if loop:
-                            asyncio.run_coroutine_threadsafe(
-                                web_server.broadcast_sensor_data(node_id, {
-                                    "duty": duty, "voltage": voltage,
-                                    "current": current, "power": power,
-                                    "last_seen": time.time(),
-                                }, user_triggered=is_user_response),
-                                loop
-                            )
-                        db.insert_reading(node_id, duty, voltage, current, power)
-                    except Exception:
-                        pass
-
-                # Post to TUI for UI update (always use call_from_thread — we're on bleak's thread)
-                if self.app and _HAS_TEXTUAL:
-                    try:
-                        msg = self.app.SensorDataMsg(
-                            node_id, duty, voltage, current, power,
-                            f"[{timestamp}] {node_tag} >> {payload}",
-                            is_user_response=is_user_response
-                        )
-                        self.app.call_from_thread(self.app.post_message, msg)
-                    except Exception as e:
-                        print(f"  [{timestamp}] {node_tag} >> {payload}  [post error: {e}]")
-                elif is_user_response or self._poll_show_log:
-                    print(f"[{timestamp}] {node_tag} >> {payload}")
-            else:
-                self.log(f"[{timestamp}] {node_tag} >> {payload}", _from_thread=True)
+            self._on_data(decoded)
+            return
 
-        elif decoded.startswith("ERROR:"):
-            # Suppress MESH_TIMEOUT during PM polling — it's just discovery probes
-            pm = self._power_manager
-            if pm and pm._polling:
-                pass  # Swallow errors during background polling (reduces TUI noise)
-            else:
-                self.log(f"[{timestamp}] !! {decoded}", style="bold red", _from_thread=True)
-        elif decoded.startswith("SENT:"):
-            # Only show in debug mode
-            if self.app and _HAS_TEXTUAL:
-                if self.app.debug_mode:
-                    self.log(f"[{timestamp}] -> {decoded}", style="dim", _from_thread=True)
-            else:
-                print(f"[{timestamp}] -> {decoded}")
-        elif decoded.startswith("MESH_READY"):
-            self.log(f"[{timestamp}] {decoded}", _from_thread=True)
-        elif decoded.startswith("TIMEOUT:"):
-            pm = self._power_manager
-            if pm and pm._polling:
-                pass  # Swallow timeouts during background polling
-            else:
-                self.log(f"[{timestamp}] !! {decoded}", style="yellow", _from_thread=True)
+        self.log(f"[{_ts()}] {decoded}", _from_thread=True)
+
+    def _on_data(self, decoded: str):
+        """Handle NODE<id>:DATA:<payload> sensor responses."""
+        parts = decoded.split(":DATA:", 1)
+        node_tag = parts[0]  # e.g. "NODE0"
+        payload = parts[1]   # e.g. "D:50%,V:12.345V,I:1234.5MA,P:15234.5MW"
+
+        # Parse sensor values
+        reading = parse_sensor(payload)
+        node_id = parse_node_id(node_tag)
+
+        if reading and node_id is not None:
+            self._on_reading(node_id, *reading, node_tag, payload)
         else:
-            self.log(f"[{timestamp}] {decoded}", _from_thread=True)
+            self.log(f"[{_ts()}] {node_tag} >> {payload}", _from_thread=True)
+
+    def _on_reading(self, node_id: str, duty: int, voltage: float,
+                    current: float, power: float, node_tag: str,
+                    payload: str):
+        """Record a parsed sensor reading and fan it out (PM, web, TUI)."""
+        # Hot path: bind attributes to locals once per reading
+        pm = self._power_manager
+        pending_user = self._pending_user_nodes
+
+        # Track this node as known (it actually exists and responded)
+        self.known_nodes.add(node_id)
+
+        # Store latest reading for web API (independent of PM).
+        # One dict per node, updated in place rather than reallocated.
+        last = self._last_readings.get(node_id)
+        if last is None:
+            last = self._last_readings[node_id] = {}
+        last["duty"] = duty
+        last["voltage"] = voltage
+        last["current"] = current
+        last["power"] = power
+        last["last_seen"] = time.time()
+
+        # Feed PowerManager
+        if pm:
+            pm.on_sensor_data(node_id, duty, voltage, current, power)
+
+        # Signal that this node responded (unblocks event-driven pacing)
+        waiter = self._node_events.get(node_id)
+        if waiter:
+            evt, loop = waiter
+            try:
+                loop.call_soon_threadsafe(evt.set)
+            except RuntimeError:
+                pass  # Waiter's loop already closed
+
+        # Determine if this is a user-triggered response
+        is_user_response = False
+        if node_id in pending_user:
+            pending_user.discard(node_id)
+            is_user_response = True
+        elif "*" in pending_user:
+            is_user_response = True
+
+        # Web dashboard: queue for the batched broadcast + DB insert
+        # (no-op unless enable_web() has run)
+        self._web_sink(
+            (node_id, duty, voltage, current, power, time.time(), is_user_response))
+
+        # Queue for the TUI: it flushes at ~15 Hz, so a burst of readings
+        # costs one table/sidebar refresh instead of one per packet
+        if self._tui_active:
+            self._pending_ui.append(
+                (node_id, duty, voltage, current, power,
+                 f"[{_ts()}] {node_tag} >> {payload}", is_user_response))
+        elif is_user_response or self._poll_show_log:
+            print(f"[{_ts()}] {node_tag} >> {payload}")
+
+    def _on_error(self, decoded: str):
+        """Handle ERROR:... from the gateway."""
+        # Suppress MESH_TIMEOUT during PM polling — it's just discovery probes
+        pm = self._power_manager
+        if pm and pm._polling:
+            pass  # Swallow errors during background polling (reduces TUI noise)
+        else:
+            self.log(f"[{_ts()}] !! {decoded}", style="bold red", _from_thread=True)
+
+    def _on_sent(self, decoded: str):
+        """Handle SENT:... command acknowledgements."""
+        # Only show in debug mode
+        if self._tui_active:
+            if self.app.debug_mode:
+                self.log(f"[{_ts()}] -> {decoded}", style="dim", _from_thread=True)
+        else:
+            print(f"[{_ts()}] -> {decoded}")
+
+    def _on_mesh_ready(self, decoded: str):
+        """Handle the MESH_READY banner."""
+        self.log(f"[{_ts()}] {decoded}", _from_thread=True)
+
+    def _on_timeout(self, decoded: str):
+        """Handle TIMEOUT:... for unanswered mesh commands."""
+        pm = self._power_manager
+        if pm and pm._polling:
+            pass  # Swallow timeouts during background polling
+        else:
+            self.log(f"[{_ts()}] !! {decoded}", style="yellow", _from_thread=True)
 
     async def connect_to_node(self, device):
         """Connect to a specific node and subscribe to notifications"""
         self.log(f"Connecting to {device.name or device.address}...")
 
-        self.client = BleakClient(device.address, dangerous_use_bleak_cache=False)
+        self._ble_loop = asyncio.get_running_loop()
+        self.client = BleakClient(device.address, dangerous_use_bleak_cache=False,
+                                  disconnected_callback=self._on_ble_disconnect)
         try:
             await self.client.connect()
         except Exception as e:
@@ -308,6 +439,10 @@ class DCMonitorGateway:
 
         self.connected_device = device
 
+        # Start the notification worker before subscribing
+        if self._rx_task is None or self._rx_task.done():
+            self._rx_task = asyncio.ensure_future(self._rx_worker())
+
         try:
             await self.client.start_notify(SENSOR_DATA_CHAR_UUID, self.notification_handler)
             self.log("Subscribed to sensor notifications")
@@ -332,19 +467,20 @@ class DCMonitorGateway:
         # Web broadcast: connection established
         if self._web_enabled:
             try:
-                import web_server
-                loop = self.ble_thread._loop if self.ble_thread else None
-                if loop:
-                    asyncio.run_coroutine_threadsafe(
-                        web_server.broadcast_state_change("connected", {
+                if self.ble_thread:
+                    self.ble_thread.submit_nowait(
+                        self._web.broadcast_state_change("connected", {
                             "device_name": getattr(device, 'name', None),
                             "device_address": device.address,
-                        }),
-                        loop
+                        })
                     )
             except Exception:
                 pass
 
+        # Start the batched web/DB writer for sensor readings
+        if self._web_enabled and (self._drain_task is None or self._drain_task.done()):
+            self._drain_task = asyncio.ensure_future(self._drain_readings())
+
         # Auto-start web poll if requested and not already running
         if self._web_poll_requested:
             pm = self._power_manager
@@ -363,17 +499,14 @@ class DCMonitorGateway:
                 # BlueZ/dbus can throw EOFError if connection already dropped
                 pass
             self.log("Disconnected")
-        self._chunk_buf = ""  # Clear stale partial data on disconnect
+        self._chunk_parts.clear()  # Clear stale partial data on disconnect
 
         # Web broadcast: disconnected
         if self._web_enabled:
             try:
-                import web_server
-                loop = self.ble_thread._loop if self.ble_thread else None
-                if loop:
-                    asyncio.run_coroutine_threadsafe(
-                        web_server.broadcast_state_change("disconnected"),
-                        loop
+                if self.ble_thread:
+                    self.ble_thread.submit_nowait(
+                        self._web.broadcast_state_change("disconnected")
                     )
             except Exception:
                 pass
@@ -400,21 +533,64 @@ class DCMonitorGateway:
                     self.log(f"Failed to send command: {e}")
                 return False
 
-    async def _wait_node_response(self, node_id: str, timeout: float = 5.0):
+    async def _drain_readings(self):
+        """Send queued readings to the dashboard and DB once per tick.
+
+        _on_reading only appends to _pending_readings; this task
+        turns each tick's worth into one WebSocket message and one DB batch.
+        """
+        pending = self._pending_readings
+        while self.running:
+            await asyncio.sleep(READINGS_FLUSH_INTERVAL)
+            if not pending:
+                continue
+            batch = [pending.popleft() for _ in range(len(pending))]
+            try:
+                self._db.insert_many(
+                    [(ts, nid, d, v, i, p, 0) for nid, d, v, i, p, ts, _ in batch])
+                await self._web.broadcast_sensor_batch(batch)
+                await self._web.broadcast_state_delta({r[0] for r in batch})
+            except Exception:
+                pass
+
+    async def _wait_node_response(self, node_id: str, timeout: float = 5.0,
+                                  send=None):
         """Wait until a specific node responds, then return immediately.
 
-        Uses a threading.Event signaled by notification_handler (bleak thread)
-        and polled from the asyncio loop. Falls back to timeout.
+        Awaits an asyncio.Event that _on_reading sets through
+        call_soon_threadsafe (it may run on bleak's thread). If `send` (a
+        coroutine) is given it is awaited after the waiter is registered,
+        so a fast reply can't be missed. Returns False on timeout.
         """
-        evt = threading.Event()
-        self._node_events[node_id] = evt
+        evt = asyncio.Event()
+        entry = (evt, asyncio.get_running_loop())
+        self._node_events[node_id] = entry
         try:
-            deadline = time.monotonic() + timeout
-            while not evt.is_set() and time.monotonic() < deadline:
-                await asyncio.sleep(0.1)  # Check every 100ms
-            return evt.is_set()
+            if send is not None:
+                await send
+            await asyncio.wait_for(evt.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
         finally:
-            self._node_events.pop(node_id, None)
+            # Only drop our own entry; a newer waiter for the same node
+            # may have replaced it in the meantime
+            if self._node_events.get(node_id) is entry:
+                del self._node_events[node_id]
+
+    async def send_and_wait(self, node: str, send, timeout: float = 5.0,
+                            settle: float = 2.0) -> bool:
+        """Await a send coroutine for `node`, then wait for its response.
+
+        Returns as soon as the node's reply arrives (True) or after
+        `timeout` (False). ALL has no single reply to wait for, so the
+        group send is followed by a fixed `settle` delay instead.
+        """
+        if str(node).upper() == "ALL":
+            await send
+            await asyncio.sleep(settle)
+            return True
+        return await self._wait_node_response(str(node), timeout, send=send)
 
     async def send_to_node(self, node: str, command: str, value: str = None,
                            _silent: bool = False):
@@ -510,8 +686,7 @@ class DCMonitorGateway:
         # Broadcast poll status to dashboard
         if self._web_enabled:
             try:
-                import web_server
-                await web_server.broadcast_state_change("poll_update", {
+                await self._web.broadcast_state_change("poll_update", {
                     "active": True, "interval": self._web_poll_interval,
                 })
             except Exception:
@@ -531,8 +706,7 @@ class DCMonitorGateway:
 
         if self._web_enabled:
             try:
-                import web_server
-                await web_server.broadcast_state_change("poll_update", {
+                await self._web.broadcast_state_change("poll_update", {
                     "active": False, "interval": self._web_poll_interval,
                 })
             except Exception:
@@ -575,19 +749,33 @@ class DCMonitorGateway:
 
     # ---- Auto-Reconnect (v0.7.0 Phase 1) ----
 
+    def _on_ble_disconnect(self, client):
+        """Bleak disconnected_callback: wake the auto-reconnect loop."""
+        loop = self._ble_loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._disconnected_evt.set)
+
     async def _auto_reconnect_loop(self):
         """Monitor BLE connection health and auto-reconnect on disconnect.
 
         Runs as a background task on the BLE thread's event loop.
-        Checks connection every 2 seconds. On disconnect:
+        Sleeps on _disconnected_evt (set by bleak's disconnected_callback)
+        while connected, so there is no periodic polling. On disconnect:
         1. Logs the event
         2. Pauses PM polling
         3. Rescans for the gateway
         4. Reconnects and resubscribes
         5. Resumes PM polling
+        Failed attempts are retried every RECONNECT_RETRY_DELAY seconds.
         """
         while self.running:
-            await asyncio.sleep(2.0)
+            if self._reconnecting:
+                await asyncio.sleep(RECONNECT_RETRY_DELAY)
+            else:
+                await self._disconnected_evt.wait()
+                self._disconnected_evt.clear()
+            if not self.running:
+                break
 
             if self.client is None or not self.client.is_connected:
                 if self._was_connected:
@@ -599,12 +787,9 @@ class DCMonitorGateway:
                     # Web broadcast: connection lost, attempting reconnect
                     if self._web_enabled:
                         try:
-                            import web_server
-                            loop = self.ble_thread._loop if self.ble_thread else None
-                            if loop:
-                                asyncio.run_coroutine_threadsafe(
-                                    web_server.broadcast_state_change("reconnecting"),
-                                    loop
+                            if self.ble_thread:
+                                self.ble_thread.submit_nowait(
+                                    self._web.broadcast_state_change("reconnecting")
                                 )
                         except Exception:
                             pass
@@ -672,14 +857,14 @@ class DCMonitorGateway:
                                         break
 
                         if not connected:
-                            self.log("[FAILOVER] No node available, retrying in 5s...",
-                                     _from_thread=True)
+                            self.log(f"[FAILOVER] No node available, retrying in "
+                                     f"{RECONNECT_RETRY_DELAY:.0f}s...", _from_thread=True)
                     else:
-                        self.log("[FAILOVER] No nodes found, retrying in 5s...",
-                                 _from_thread=True)
+                        self.log(f"[FAILOVER] No nodes found, retrying in "
+                                 f"{RECONNECT_RETRY_DELAY:.0f}s...", _from_thread=True)
                 except Exception as e:
-                    self.log(f"[FAILOVER] Error: {e}, retrying in 5s...",
-                             _from_thread=True)
+                    self.log(f"[FAILOVER] Error: {e}, retrying in "
+                             f"{RECONNECT_RETRY_DELAY:.0f}s...", _from_thread=True)
 
     # ---- Legacy plain CLI interactive mode (--no-tui) ----
 
@@ -712,12 +897,16 @@ class DCMonitorGateway:
         print("=" * 50)
         print()
 
+        loop = asyncio.get_running_loop()
         while self.running and self.client.is_connected:
             try:
                 prompt = f"[node {self.target_node}]> "
-                cmd = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: input(prompt).strip().lower()
-                )
+                if _ainput is not None:
+                    cmd = (await _ainput(prompt)).strip().lower()
+                else:
+                    cmd = await loop.run_in_executor(
+                        None, lambda: input(prompt).strip().lower()
+                    )
 
                 if not cmd:
                     continue
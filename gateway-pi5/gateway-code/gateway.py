@@ -19,22 +19,43 @@ which forwards them to the targeted mesh node via BLE Mesh.
 
 import argparse
 import asyncio
-import sys
 
-from dc_gateway import DCMonitorGateway
+# dc_gateway (bleak), tui_app (textual) and the web modules are imported
+# only on the code path that needs them, so e.g. --scan never loads textual
 
-# Check for textual
-_HAS_TEXTUAL = False
-try:
-    from tui_app import MeshGatewayApp
-    _HAS_TEXTUAL = True
-except ImportError:
-    print("Note: textual not available. Install with: pip install textual")
-    print("      Falling back to plain CLI mode.\n")
 
+def _use_uvloop():
+    """Make asyncio.run() use uvloop when it is installed.
 
-def main():
-    """Entry point — decides between TUI and CLI mode."""
+    Not applied to the TUI: Textual owns that loop, and its BLE work
+    already runs on BleThread's (uvloop) loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+# Startup banners for CLI and web-only mode
+_RULE = "=" * 50
+_BANNER = f"\n{_RULE}\n  DC Monitor Mesh Gateway (Pi 5)\n{_RULE}"
+_WEB_BANNER = f"\n{_RULE}\n  DC Monitor Mesh Gateway — Web Only Mode\n{_RULE}"
+
+# Flags that make this a one-shot run (--duty is checked separately)
+ONESHOT_ACTIONS = ("scan", "stop", "ramp", "status", "read", "monitor")
+
+# Accepted --node values (already uppercased)
+_VALID_NODES = frozenset(("ALL", *map(str, range(10))))
+
+_PARSER = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser once and reuse it."""
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
     parser = argparse.ArgumentParser(description="BLE Gateway for DC Monitor Mesh")
     parser.add_argument("--scan", action="store_true", help="Scan for gateways only")
     parser.add_argument("--address", type=str, help="Connect to specific MAC address")
@@ -55,24 +76,47 @@ def main():
                         help="Web dashboard only, no TUI")
     parser.add_argument("--web-port", type=int, default=8000,
                         help="Web dashboard port (default 8000)")
+    _PARSER = parser
+    return parser
+
+
+def main():
+    """Entry point — decides between TUI and CLI mode."""
+    parser = _get_parser()
     args = parser.parse_args()
 
-    # Validate --node argument
-    if args.node.upper() != "ALL" and not (args.node.isdigit() and 0 <= int(args.node) <= 9):
+    # Validate and normalize --node argument in one lookup
+    node = args.node.upper()
+    if node not in _VALID_NODES:
         parser.error(f"Invalid node ID '{args.node}': use 0-9 or ALL")
 
-    node = args.node.upper() if args.node.upper() == "ALL" else args.node
-    is_oneshot = args.scan or args.stop or args.ramp or args.status or args.read \
-        or args.monitor or args.duty is not None
+    is_oneshot = args.duty is not None or any(getattr(args, a) for a in ONESHOT_ACTIONS)
+
+    # --scan fast path: just the scan, no gateway object or banner
+    if args.scan:
+        _use_uvloop()
+        asyncio.run(_fast_scan(args.timeout, args.address))
+        return
 
     # Web-only mode: no TUI, just web dashboard + BLE
     if args.web_only:
         _run_web_only(args, node)
         return
 
+    # Check for textual (only when the TUI would actually be used)
+    has_textual = False
+    if not is_oneshot and not args.no_tui:
+        try:
+            from tui_app import MeshGatewayApp
+            has_textual = True
+        except ImportError:
+            print("Note: textual not available. Install with: pip install textual")
+            print("      Falling back to plain CLI mode.\n")
+
     # If TUI available and not one-shot and not --no-tui, launch TUI
     # Textual's app.run() manages its own event loop, so call it directly (not from asyncio.run)
-    if _HAS_TEXTUAL and not is_oneshot and not args.no_tui:
+    if has_textual:
+        from dc_gateway import DCMonitorGateway
         gateway = DCMonitorGateway()
 
         # Initialize web dashboard if --web flag is set
@@ -81,7 +125,7 @@ def main():
             import web_server
             db.init_db()
             web_server.set_gateway(gateway)
-            gateway._web_enabled = True
+            gateway.enable_web()
             gateway._web_port = args.web_port
             # Auto-start poll at 2s when web dashboard is active
             gateway._web_poll_requested = True
@@ -97,69 +141,67 @@ def main():
         return
 
     # Otherwise: one-shot or legacy CLI mode (needs asyncio.run)
+    _use_uvloop()
     asyncio.run(_run_cli(args, node))
 
 
+async def _fast_scan(timeout: float, target_address: str = None):
+    """Scan for gateways and print what was found."""
+    from dc_gateway import scan_for_gateways
+    devices = await scan_for_gateways(
+        timeout, target_address, log=lambda text: print(f"  {text}"))
+    print(f"\nFound {len(devices)} gateway(s)")
+
+
 async def _run_cli(args, node: str):
     """Run one-shot CLI commands or legacy interactive mode."""
+    from dc_gateway import DCMonitorGateway, find_device
     gateway = DCMonitorGateway()
 
-    print("\n" + "=" * 50)
-    print("  DC Monitor Mesh Gateway (Pi 5)")
-    print("=" * 50)
+    print(_BANNER)
 
     devices = await gateway.scan_for_nodes(
         timeout=args.timeout, target_address=args.address
     )
 
-    if args.scan:
-        print(f"\nFound {len(devices)} gateway(s)")
-        return
-
     if not devices:
         return
 
-    # Select device
-    if args.address:
-        device = next(
-            (d for d in devices if d.address.upper() == args.address.upper()),
-            devices[0],
-        )
-    else:
-        device = devices[0]
+    # Select device: the requested address if found, else the first
+    device = find_device(devices, args.address) or devices[0]
 
     # Connect
     if not await gateway.connect_to_node(device):
         return
 
-    # Handle one-shot CLI commands
+    responded = None
+    # Handle one-shot CLI commands: each returns as soon as the node replies
+    # (a ramp steps through 5 duty levels first, so it gets a longer timeout)
     if args.stop:
-        await gateway.stop_node(node)
-        await asyncio.sleep(1)
+        responded = await gateway.send_and_wait(node, gateway.stop_node(node), settle=1)
     elif args.duty is not None:
-        await gateway.set_duty(node, args.duty)
-        await asyncio.sleep(2)
+        responded = await gateway.send_and_wait(node, gateway.set_duty(node, args.duty))
     elif args.ramp:
-        await gateway.start_ramp(node)
-        await asyncio.sleep(2)
+        responded = await gateway.send_and_wait(node, gateway.start_ramp(node), timeout=10.0)
     elif args.status:
-        await gateway.read_status(node)
-        await asyncio.sleep(2)
+        responded = await gateway.send_and_wait(node, gateway.read_status(node))
     elif args.read:
-        await gateway.read_sensor(node)
-        await asyncio.sleep(2)
+        responded = await gateway.send_and_wait(node, gateway.read_sensor(node))
     elif args.monitor:
         await gateway.start_monitor(node)
         print("Monitoring... press Ctrl+C to stop")
         try:
-            while gateway.client and gateway.client.is_connected:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            pass
+            # Set by bleak's disconnected_callback, so no polling is needed
+            await gateway._disconnected_evt.wait()
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass  # Ctrl+C: asyncio.run cancels us; still disconnect cleanly
     else:
         # Legacy interactive mode (--no-tui)
         await gateway.interactive_mode(default_node=node)
 
+    if responded is False:
+        print(f"  No response from node {node}")
+
     await gateway.disconnect()
 
 
@@ -167,33 +209,28 @@ def _run_web_only(args, node: str):
     """Run gateway with web dashboard only (no TUI)."""
     import db
     import web_server
-    import uvicorn
     from ble_thread import BleThread
+    from dc_gateway import DCMonitorGateway, find_device
 
     gateway = DCMonitorGateway()
-    gateway._web_enabled = True
+    gateway.enable_web()
     # Auto-start poll at 2s when web dashboard is active
     gateway._web_poll_requested = True
     gateway._web_poll_interval = 2.0
 
-    bt = BleThread()
-    bt.start()
-    gateway.ble_thread = bt
-
     db.init_db()
     web_server.set_gateway(gateway)
 
     async def startup_and_serve():
+        # BLE, uvicorn and the gateway's broadcasts all share this one loop,
+        # so no separate BLE thread is needed
+        gateway.ble_thread = BleThread.attach_running_loop()
+
         # Scan and connect
         devices = await gateway.scan_for_nodes(
             timeout=args.timeout, target_address=args.address)
         if devices:
-            if args.address:
-                device = next(
-                    (d for d in devices if d.address.upper() == args.address.upper()),
-                    devices[0])
-            else:
-                device = devices[0]
+            device = find_device(devices, args.address) or devices[0]
 
             # Try each device until one connects
             for dev in ([device] + [d for d in devices if d != device]):
@@ -207,28 +244,22 @@ def _run_web_only(args, node: str):
             print("  No gateways found. Web server starting anyway...")
 
         # Start uvicorn
-        config = uvicorn.Config(
-            web_server.app, host="0.0.0.0", port=args.web_port,
-            log_level="info")
-        server = uvicorn.Server(config)
-        await server.serve()
-
-    print("\n" + "=" * 50)
-    print("  DC Monitor Mesh Gateway — Web Only Mode")
-    print("=" * 50)
+        await web_server.create_server(args.web_port).serve()
+
+    print(_WEB_BANNER)
     print(f"  Dashboard: http://0.0.0.0:{args.web_port}")
     print(f"  API:       http://0.0.0.0:{args.web_port}/api/state")
     print(f"  WebSocket: ws://0.0.0.0:{args.web_port}/ws")
     print()
 
-    future = bt.submit(startup_and_serve())
+    _use_uvloop()
     try:
-        future.result()
+        asyncio.run(startup_and_serve())
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
         gateway.running = False
-        bt.stop()
+        db.flush()
 
 
 if __name__ == "__main__":
@@ -1,19 +1,35 @@
 """Data class tracking the state of a single mesh node."""
 
-import time
 from dataclasses import dataclass, field
+from time import monotonic_ns
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class NodeState:
-    """Tracks the last known state of a single mesh node."""
+    """Tracks the last known state of a single mesh node.
+
+    Slotted (no per-instance __dict__); compared by identity.
+    """
     node_id: str
     duty: int = 0              # Current duty from sensor reading
     target_duty: int = 0       # User-requested duty % (restored when threshold off)
     commanded_duty: int = 0    # Last duty % sent by PowerManager (not from sensor)
+    commanded_duty_f: float = 0.0  # Unrounded duty behind commanded_duty
     voltage: float = 0.0       # V
     current: float = 0.0       # mA
     power: float = 0.0         # mW
-    last_seen: float = field(default_factory=time.monotonic)
+    last_seen: int = field(default_factory=monotonic_ns)  # ns, monotonic clock
     responsive: bool = True
     poll_gen: int = 0          # Which poll cycle this data is from
+    nudge_sig: tuple = ()      # (mw/pct, ceiling, share, current) of the last no-change eval
+
+    def update(self, duty: int, voltage: float, current: float,
+               power: float, gen: int, now: int = None):
+        """Record a fresh sensor reading (marks the node responsive)."""
+        self.duty = duty
+        self.voltage = voltage
+        self.current = current
+        self.power = power
+        self.poll_gen = gen
+        self.last_seen = monotonic_ns() if now is None else now
+        self.responsive = True
@@ -4,6 +4,7 @@ Maintains total power near (threshold - headroom) by nudging node
 duty cycles up or down each poll cycle:
   - No priority: all nodes get equal power share (budget/N)
   - With priority: priority node gets PRIORITY_WEIGHT x normal share
+  - Water-filling: budget a capped node can't use goes to the others
   - Bidirectional: increases duty when under budget, decreases when over
   - Gradual: max STEP_SIZE% change per cycle prevents oscillation
 """
@@ -11,6 +12,9 @@ duty cycles up or down each poll cycle:
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import heapq
+import io
 import time
 from typing import Optional, TYPE_CHECKING
 
@@ -20,6 +24,37 @@ if TYPE_CHECKING:
     from dc_gateway import DCMonitorGateway
 
 
+def _water_fill(budget: float, caps: dict[str, float],
+                weights: dict[str, float]) -> tuple[dict[str, float], float]:
+    """Max-min fair split of budget across nodes with per-node power caps.
+
+    Each round offers every remaining node `level * weight`; nodes whose cap
+    is at or below that are pinned at their cap and their unused budget goes
+    back into the pool for the rest. Returns ({nid: share_mw}, level), where
+    level is the final per-weight share of the unpinned nodes.
+    """
+    shares = {}
+    remaining = budget
+    total_weight = sum(weights.values())
+    # Smallest cap per unit weight first, so pinned nodes come off the front
+    order = sorted(caps, key=lambda nid: caps[nid] / weights[nid])
+    level = 0.0
+    for i, nid in enumerate(order):
+        level = remaining / total_weight
+        if caps[nid] > level * weights[nid]:
+            # Nothing left to pin — everyone else shares the water level
+            for rest in order[i:]:
+                shares[rest] = level * weights[rest]
+            break
+        shares[nid] = caps[nid]
+        remaining -= caps[nid]
+        total_weight -= weights[nid]
+    else:
+        if order:  # Everyone pinned — report the highest per-weight cap
+            level = caps[order[-1]] / weights[order[-1]]
+    return shares, level
+
+
 class PowerManager:
     """Equilibrium-based power balancer for mesh nodes.
 
@@ -27,11 +62,14 @@ class PowerManager:
     duty cycles up or down each poll cycle:
       - No priority: all nodes get equal power share (budget/N)
       - With priority: priority node gets PRIORITY_WEIGHT x normal share
+      - Water-filling: budget a capped node can't use goes to the others
       - Bidirectional: increases duty when under budget, decreases when over
       - Gradual: max STEP_SIZE% change per cycle prevents oscillation
     """
 
-    POLL_INTERVAL = 3.0    # Seconds between poll cycles
+    POLL_INTERVAL = 3.0    # Seconds between poll cycles (starting value, adapts)
+    MIN_POLL_INTERVAL = 1.0   # Floor when far from budget
+    MAX_POLL_INTERVAL = 15.0  # Ceiling when holding inside the dead band
     READ_STAGGER = 2.5     # Seconds between READ commands (must exceed mesh SEND_COMP time)
     STALE_TIMEOUT = 45.0   # Seconds before marking node unresponsive (relay round trips are slow)
     COOLDOWN = 5.0         # Seconds between adjustments (give mesh time to settle)
@@ -41,13 +79,27 @@ class PowerManager:
     def __init__(self, gateway):
         self.gateway = gateway
         self.nodes: dict[str, NodeState] = {}
+        self._responsive_ids: set[str] = set()  # ids of nodes with responsive=True
+        self._seen_heap: list[tuple[int, str]] = []  # (last_seen, id), see _mark_stale_nodes
+        self._sorted_ids: Optional[list[str]] = None  # Cached numeric order, see _get_sorted_ids
+        self._shares_cache = None  # (key, (priority_share, normal_share)), see _get_shares
         self.threshold_mw: Optional[float] = None
         self.priority_node: Optional[str] = None
         self._adjusting = False
-        self._last_adjustment: float = 0
+        self._cooldown_done = asyncio.Event()  # Cleared for COOLDOWN s after an adjustment
+        self._cooldown_done.set()
+        self._cooldown_timer: Optional[asyncio.TimerHandle] = None
         self._force_evaluate = False  # Set True to bypass cooldown on next eval
+        self._current_interval: float = self.POLL_INTERVAL  # see _adapt_interval
+        self._debug_enabled = False  # gateway.debug_enabled(), refreshed each evaluation
         self._poll_generation: int = 0
+        self._poll_reported: set[str] = set()  # ids that reported this generation
+        self._poll_complete = asyncio.Event()  # Set once every responsive node reported
         self._polling = False  # True while a poll cycle is active
+        self._poll_task: Optional[asyncio.Task] = None  # Task running poll_loop
+        self._poll_wake = asyncio.Event()  # Cuts poll_loop's interval sleep short
+        self._inflight = 0  # PM duty/READ commands awaiting a reply, see _tracked
+        self._inflight_cond = asyncio.Condition()
         self._needs_bootstrap = False
         self._paused = False  # Set True by reconnect loop to pause polling
 
@@ -70,13 +122,14 @@ class PowerManager:
                     self.gateway.log(
                         f"[PM] N{ns.node_id} target frozen at {ns.duty}%")
         # Force immediate evaluation on next poll cycle
-        # (uses a flag instead of _last_adjustment=0 to survive race with
+        # (uses a flag instead of resetting the cooldown to survive race with
         # a concurrently-finishing _evaluate_and_adjust on the BLE thread)
         self._force_evaluate = True
         self._adjusting = False  # Clear any in-progress flag
+        self._poll_wake.set()  # Don't sit out the rest of a long interval
         budget = mw - self.HEADROOM_MW
-        n = len([ns for ns in self.nodes.values() if ns.responsive]) or 1
-        share = budget / n
+        n = len(self._responsive_ids) or 1
+        share = self._get_shares(with_priority=False)[1]
         self.gateway.log(
             f"[POWER] Threshold: {mw:.0f}mW → budget {budget:.0f}mW "
             f"({share:.0f}mW × {n} nodes)")
@@ -85,8 +138,17 @@ class PowerManager:
         """Disable power management and restore original duty cycles."""
         self.threshold_mw = None
         self._polling = False
+        self._poll_complete.set()  # Release any _wait_for_responses
+        self._poll_wake.set()  # Let a sleeping poll_loop see the threshold is gone
+        # Stop the poll loop (and with it the evaluator) so no nudge can go
+        # out after the restore, and a re-enable starts from a clean slate
+        task = self._poll_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
         # Wait for any in-flight mesh commands to complete before restoring
-        await asyncio.sleep(2.0)
+        async with self._inflight_cond:
+            await self._inflight_cond.wait_for(lambda: self._inflight == 0)
         # Restore all nodes to their target duty
         for ns in self.nodes.values():
             if ns.commanded_duty != ns.target_duty and ns.target_duty > 0:
@@ -103,12 +165,7 @@ class PowerManager:
         self.priority_node = node_id
         self._force_evaluate = True  # Force rebalance on next cycle
         if self.threshold_mw:
-            budget = self.threshold_mw - self.HEADROOM_MW
-            responsive = [ns for ns in self.nodes.values() if ns.responsive]
-            n = len(responsive) or 1
-            total_shares = self.PRIORITY_WEIGHT + (n - 1)
-            pri_share = budget * (self.PRIORITY_WEIGHT / total_shares)
-            other_share = budget * (1.0 / total_shares)
+            pri_share, other_share = self._get_shares(with_priority=True)
             self.gateway.log(
                 f"[POWER] Priority: N{node_id} ({pri_share:.0f}mW), "
                 f"others: {other_share:.0f}mW each")
@@ -120,94 +177,147 @@ class PowerManager:
         self.priority_node = None
         self._force_evaluate = True  # Force rebalance on next cycle
         if self.threshold_mw:
-            budget = self.threshold_mw - self.HEADROOM_MW
-            n = len([ns for ns in self.nodes.values() if ns.responsive]) or 1
-            share = budget / n
+            share = self._get_shares(with_priority=False)[1]
             self.gateway.log(f"[POWER] Priority cleared → equalizing at {share:.0f}mW each")
         else:
             self.gateway.log("[POWER] Priority cleared")
 
     def set_target_duty(self, node_id: str, duty: int):
-        """Record the user-requested duty for a node."""
-        if node_id not in self.nodes:
-            self.nodes[node_id] = NodeState(node_id=node_id)
-        self.nodes[node_id].target_duty = duty
+        """Record the user-requested duty for a node.
+
+        Only real (numeric) node ids are tracked; group targets like "ALL"
+        are expanded by the caller and never stored in self.nodes.
+        """
+        if not node_id.isdigit():
+            return
+        ns = self.nodes.get(node_id) or self._add_node(node_id)
+        ns.target_duty = duty
         # Also sync commanded_duty so PM's mw_per_pct estimate stays accurate
         # when user changes duty while PM is active
-        self.nodes[node_id].commanded_duty = duty
+        ns.commanded_duty = duty
+
+    _STATUS_TMPL = ("  Node {nid}: D:{d}%{tgt} V:{v:.2f}V I:{i:.1f}mA "
+                    "P:{p:.0f}mW [{st}]{share}\n")
 
     def status(self) -> str:
         """Return a human-readable status summary."""
-        lines = []
-        lines.append("--- Power Manager ---")
-        if self.threshold_mw is not None:
-            budget = self.threshold_mw - self.HEADROOM_MW
-            lines.append(f"Threshold: {self.threshold_mw:.0f} mW")
-            lines.append(f"Budget:    {budget:.0f} mW (headroom: {self.HEADROOM_MW:.0f} mW)")
+        buf = io.StringIO()
+        write = buf.write
+        write("--- Power Manager ---\n")
+        threshold = self.threshold_mw
+        if threshold is not None:
+            write(f"Threshold: {threshold:.0f} mW\n"
+                  f"Budget:    {threshold - self.HEADROOM_MW:.0f} mW "
+                  f"(headroom: {self.HEADROOM_MW:.0f} mW)\n")
         else:
-            lines.append("Threshold: OFF")
+            write("Threshold: OFF\n")
         if self.priority_node is not None:
-            lines.append(f"Priority:  node {self.priority_node}")
+            write(f"Priority:  node {self.priority_node}\n")
         else:
-            lines.append("Priority:  none")
-
-        total = 0.0
-        responsive_count = sum(1 for ns in self.nodes.values() if ns.responsive)
-        if self.nodes:
-            # Calculate shares for display
-            share_info = {}
-            if self.threshold_mw is not None and responsive_count > 0:
-                budget = self.threshold_mw - self.HEADROOM_MW
-                if self.priority_node and self.priority_node in self.nodes:
-                    total_shares = self.PRIORITY_WEIGHT + (responsive_count - 1)
-                    for nid in self.nodes:
-                        if nid == self.priority_node:
-                            share_info[nid] = budget * (self.PRIORITY_WEIGHT / total_shares)
-                        else:
-                            share_info[nid] = budget * (1.0 / total_shares)
+            write("Priority:  none\n")
+
+        nodes = self.nodes
+        if nodes:
+            # Shares for display (memoized in _get_shares)
+            show_shares = threshold is not None and bool(self._responsive_ids)
+            priority = self.priority_node
+            with_priority = bool(priority) and priority in nodes
+            if show_shares:
+                pri_share, per_share = self._get_shares(with_priority)
+
+            write("Nodes:\n")
+            tmpl = self._STATUS_TMPL.format
+            total = 0.0
+            for nid in self._get_sorted_ids():
+                ns = nodes[nid]
+                if show_shares:
+                    share_mw = pri_share if with_priority and nid == priority else per_share
+                    share = f" share:{share_mw:.0f}mW"
                 else:
-                    per_share = budget / responsive_count
-                    for nid in self.nodes:
-                        share_info[nid] = per_share
-
-            lines.append("Nodes:")
-            for nid in sorted(self.nodes.keys()):
-                ns = self.nodes[nid]
-                st = "ok" if ns.responsive else "stale"
-                target = f" (target:{ns.target_duty}%)" if ns.target_duty != ns.duty else ""
-                share = f" share:{share_info[nid]:.0f}mW" if nid in share_info else ""
-                lines.append(
-                    f"  Node {nid}: D:{ns.duty}%{target} "
-                    f"V:{ns.voltage:.2f}V I:{ns.current:.1f}mA "
-                    f"P:{ns.power:.0f}mW [{st}]{share}"
-                )
+                    share = ""
+                write(tmpl(
+                    nid=nid, d=ns.duty,
+                    tgt=f" (target:{ns.target_duty}%)" if ns.target_duty != ns.duty else "",
+                    v=ns.voltage, i=ns.current, p=ns.power,
+                    st="ok" if ns.responsive else "stale", share=share))
                 if ns.responsive:
                     total += ns.power
-            lines.append(f"Total power: {total:.0f} mW")
-            if self.threshold_mw is not None:
-                headroom = self.threshold_mw - total
-                lines.append(f"Headroom:    {headroom:.0f} mW")
+            write(f"Total power: {total:.0f} mW\n")
+            if threshold is not None:
+                write(f"Headroom:    {threshold - total:.0f} mW\n")
         else:
-            lines.append("No nodes discovered yet")
-        lines.append("--------------------")
-        return "\n".join(lines)
+            write("No nodes discovered yet\n")
+        write("--------------------")
+        return buf.getvalue()
+
+    def _add_node(self, node_id: str) -> NodeState:
+        """Create and register a NodeState (new nodes start responsive)."""
+        ns = self.nodes[node_id] = NodeState(node_id=node_id)
+        self._sorted_ids = None
+        self._responsive_ids.add(node_id)
+        heapq.heappush(self._seen_heap, (ns.last_seen, node_id))
+        return ns
+
+    @contextlib.asynccontextmanager
+    async def _tracked(self):
+        """Count a mesh command as in flight until its reply (or timeout)."""
+        self._inflight += 1
+        try:
+            yield
+        finally:
+            self._inflight -= 1
+            async with self._inflight_cond:
+                self._inflight_cond.notify_all()
+
+    def _get_sorted_ids(self) -> list[str]:
+        """Node ids in numeric order, re-sorted only after a node is added.
+
+        Every insert into self.nodes goes through _add_node, which drops the
+        cache; status() and the balancers then filter this one list instead
+        of sorting per call.
+        """
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.nodes, key=int)
+        return self._sorted_ids
+
+    def _get_shares(self, with_priority: bool) -> tuple[float, float]:
+        """Return (priority_share, normal_share) in mW for the current budget.
+
+        Memoized on (threshold, responsive count, with_priority): the cache
+        invalidates itself whenever one of those changes.
+        """
+        n = len(self._responsive_ids) or 1
+        key = (self.threshold_mw, n, with_priority)
+        cached = self._shares_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        budget = self.threshold_mw - self.HEADROOM_MW
+        if with_priority:
+            total_shares = self.PRIORITY_WEIGHT + (n - 1)
+            shares = (budget * (self.PRIORITY_WEIGHT / total_shares), budget / total_shares)
+        else:
+            shares = (budget / n, budget / n)
+        self._shares_cache = (key, shares)
+        return shares
 
     # ---- Notification Hook ----
 
     def on_sensor_data(self, node_id: str, duty: int, voltage: float,
                        current: float, power: float):
         """Update node state from parsed sensor data."""
-        if node_id not in self.nodes:
-            self.nodes[node_id] = NodeState(node_id=node_id)
-
-        ns = self.nodes[node_id]
-        ns.duty = duty
-        ns.voltage = voltage
-        ns.current = current
-        ns.power = power
-        ns.last_seen = time.monotonic()
-        ns.responsive = True
-        ns.poll_gen = self._poll_generation
+        ns = self.nodes.get(node_id) or self._add_node(node_id)
+
+        ns.update(duty, voltage, current, power, self._poll_generation)
+        self._responsive_ids.add(node_id)
+        heap = self._seen_heap
+        heapq.heappush(heap, (ns.last_seen, node_id))
+        if len(heap) > 8 * len(self.nodes) + 64:
+            # Stale sweeps only run while PM polls; drop superseded entries
+            heap[:] = [(n.last_seen, nid) for nid, n in self.nodes.items()]
+            heapq.heapify(heap)
+        self._poll_reported.add(node_id)
+        if self._responsive_ids <= self._poll_reported:
+            self._poll_complete.set()
 
         # Only sync commanded_duty when PM is OFF — when PM is active,
         # only _nudge_node() updates commanded_duty (avoids stale sensor
@@ -240,28 +350,52 @@ class PowerManager:
             self.gateway.log(
                 f"[POWER] {len(self.gateway.known_nodes)} node(s) already discovered")
             # Seed PM from known_nodes
-            for nid in self.gateway.known_nodes:
-                if nid not in self.nodes:
-                    await self.gateway.send_to_node(nid, "READ", _silent=True)
-                    await self.gateway._wait_node_response(nid)
+            await self._probe_all(
+                [nid for nid in self.gateway.known_nodes if nid not in self.nodes],
+                announce=False)
             return
 
         self.gateway.log(f"[POWER] Probing {count} sensing node(s)...")
+        to_probe = []
         for nid in range(1, count + 1):
-            if self.threshold_mw is None:
-                return
             nid_str = str(nid)
             if nid_str in self.nodes:
                 self.gateway.log(f"[POWER] Node {nid} already known")
-                continue
-            await self.gateway.send_to_node(nid_str, "READ", _silent=True)
-            responded = await self.gateway._wait_node_response(nid_str)
-            if responded:
-                self.gateway.log(f"[POWER] Found node {nid}")
             else:
-                self.gateway.log(f"[POWER] Node {nid} no response")
+                to_probe.append(nid_str)
+        await self._probe_all(to_probe)
         self.gateway.log(f"[POWER] Discovery complete: {len(self.nodes)} node(s)")
 
+    async def _probe_all(self, node_ids: list, announce: bool = True):
+        """READ every node in node_ids concurrently.
+
+        Sends are staggered across READ_STAGGER so the mesh isn't handed
+        several sends at once; the waits overlap, so discovery takes about
+        one response time instead of one per node.
+        """
+        if not node_ids:
+            return
+        stagger = self.READ_STAGGER / len(node_ids)
+        await asyncio.gather(
+            *(self._probe(nid, i * stagger, announce) for i, nid in enumerate(node_ids)),
+            return_exceptions=True)
+
+    async def _probe(self, nid: str, delay: float, announce: bool):
+        """Send one discovery READ after `delay` and wait for the reply."""
+        if delay:
+            await asyncio.sleep(delay)
+        if self.threshold_mw is None:
+            return  # PM was disabled while we waited our turn
+        gw = self.gateway
+        async with self._tracked():
+            responded = await gw._wait_node_response(
+                nid, send=gw.send_to_node(nid, "READ", _silent=True))
+        if announce:
+            if responded:
+                gw.log(f"[POWER] Found node {nid}")
+            else:
+                gw.log(f"[POWER] Node {nid} no response")
+
     async def poll_loop(self):
         """Periodic poll-and-adjust cycle. Called by TUI @work or asyncio task."""
         if self._polling:
@@ -275,6 +409,8 @@ class PowerManager:
             else:
                 # Old loop is genuinely still running — let it handle things
                 return
+        me = asyncio.current_task()
+        self._poll_task = me
         try:
             if getattr(self, '_needs_bootstrap', False):
                 self._needs_bootstrap = False
@@ -288,25 +424,56 @@ class PowerManager:
                 gw._web_poll_task.cancel()
                 gw.log("[POLL] Paused — PowerManager active")
 
-            while self.threshold_mw is not None:
-                if self._paused:
-                    await asyncio.sleep(1.0)
-                    continue
-                await self._poll_all_nodes()
-                await self._wait_for_responses(timeout=4.0)
-                self._mark_stale_nodes()
-                await asyncio.sleep(1.0)  # Relay breathing gap — let radio catch up
-                await self._evaluate_and_adjust()
-                await asyncio.sleep(self.POLL_INTERVAL)
-            self._polling = False
+            # Polling produces snapshots; a separate task evaluates them, so
+            # the next poll can go out while the last nudges are still
+            # being acknowledged
+            snapshots: asyncio.Queue[int] = asyncio.Queue(maxsize=1)
+            evaluator = asyncio.ensure_future(self._evaluate_loop(snapshots))
+            try:
+                # A newer poll_loop (threshold off then on again) takes over
+                # from this one instead of running alongside it
+                while self.threshold_mw is not None and self._poll_task is me:
+                    if self._paused:
+                        await asyncio.sleep(1.0)
+                        continue
+                    await self._poll_all_nodes()
+                    await self._wait_for_responses(timeout=4.0)
+                    self._mark_stale_nodes()
+                    if snapshots.full():
+                        snapshots.get_nowait()  # Evaluator is busy — keep only the newest
+                    snapshots.put_nowait(self._poll_generation)
+                    # Interval sleep; set_threshold()/disable() wake it early
+                    try:
+                        await asyncio.wait_for(self._poll_wake.wait(),
+                                               self._current_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._poll_wake.clear()
+            finally:
+                evaluator.cancel()
+                await asyncio.gather(evaluator, return_exceptions=True)
         except asyncio.CancelledError:
-            self._polling = False
+            pass
+        if self._poll_task is not me:
+            return  # Superseded: the newer loop owns _polling and web poll
+        self._poll_task = None
+        self._polling = False
 
         # Resume web auto-poll if user had it enabled
         if getattr(self.gateway, '_web_poll_requested', False):
             asyncio.ensure_future(self.gateway.start_web_poll(
                 self.gateway._web_poll_interval))
 
+    async def _evaluate_loop(self, snapshots: asyncio.Queue):
+        """Consumer side of poll_loop: evaluate each fresh poll snapshot."""
+        while True:
+            await snapshots.get()
+            await asyncio.sleep(1.0)  # Relay breathing gap — let radio catch up
+            try:
+                await self._evaluate_and_adjust()
+            except Exception as e:
+                self.gateway.log(f"[PM] Evaluation error: {e}")
+
     async def _poll_all_nodes(self):
         """Poll all nodes with a single group READ.
 
@@ -314,38 +481,47 @@ class PowerManager:
         group send (0xC000).  All subscribed nodes respond individually.
         """
         self._poll_generation += 1
+        self._poll_reported.clear()
+        self._poll_complete.clear()
         if not self.nodes:
             return
         await self.gateway.send_to_node("ALL", "READ", _silent=True)
         await self._wait_for_responses(timeout=3.0)
 
     async def _wait_for_responses(self, timeout: float = 3.0):
-        """Wait until all responsive nodes report for this poll cycle, or timeout."""
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            if self.threshold_mw is None:
-                return
-            all_fresh = all(
-                ns.poll_gen == self._poll_generation
-                for ns in self.nodes.values()
-                if ns.responsive
-            )
-            if all_fresh:
-                return
-            await asyncio.sleep(0.1)
+        """Wait until all responsive nodes report for this poll cycle, or timeout.
+
+        on_sensor_data sets _poll_complete when the last one reports (and
+        disable() sets it to release the wait), so nothing is rescanned.
+        """
+        if self.threshold_mw is None or self._responsive_ids <= self._poll_reported:
+            return
+        try:
+            await asyncio.wait_for(self._poll_complete.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
 
     def _mark_stale_nodes(self):
-        """Mark nodes that haven't responded recently as unresponsive."""
-        now = time.monotonic()
-        for ns in self.nodes.values():
-            if not ns.node_id.isdigit():
-                continue  # Skip phantom nodes like "ALL"
-            age = now - ns.last_seen
-            if age > self.STALE_TIMEOUT:
-                if ns.responsive:
-                    self.gateway.log(
-                        f"[POWER] Node {ns.node_id} unresponsive ({age:.0f}s)")
-                ns.responsive = False
+        """Mark nodes that haven't responded recently as unresponsive.
+
+        Every reading pushes (last_seen, id) onto _seen_heap, so only entries
+        older than STALE_TIMEOUT are popped here. An entry whose timestamp no
+        longer matches the node's last_seen was superseded by a newer reading
+        and is simply dropped.
+        """
+        now = time.monotonic_ns()
+        cutoff = now - int(self.STALE_TIMEOUT * 1e9)
+        heap = self._seen_heap
+        while heap and heap[0][0] < cutoff:
+            seen, nid = heapq.heappop(heap)
+            ns = self.nodes.get(nid)
+            if ns is None or ns.last_seen != seen:
+                continue
+            if ns.responsive:
+                self.gateway.log(
+                    f"[POWER] Node {nid} unresponsive ({(now - seen) / 1e9:.0f}s)")
+            ns.responsive = False
+            self._responsive_ids.discard(nid)
 
     async def _evaluate_and_adjust(self):
         """Bidirectional equilibrium: nudge nodes toward their power budget share.
@@ -353,39 +529,43 @@ class PowerManager:
         Increases duty when under budget, decreases when over.
         Dead band prevents jitter when close to target.
         """
+        # Refreshed once per cycle; guards every f-string built only for
+        # _debug logs so nothing is formatted while debug mode is off
+        self._debug_enabled = debug = self.gateway.debug_enabled()
         if self.threshold_mw is None or self._adjusting:
             self.gateway.log(
                 f"[PM] skip: threshold={self.threshold_mw}, adjusting={self._adjusting}",
                 _debug=True)
             return
 
-        since = time.monotonic() - self._last_adjustment
         forced = self._force_evaluate
-        if not forced and since < self.COOLDOWN:
-            self.gateway.log(f"[PM] skip: cooldown {since:.1f}/{self.COOLDOWN}s",
-                             _debug=True)
+        if not forced and not self._cooldown_done.is_set():
+            self.gateway.log(f"[PM] skip: cooldown ({self.COOLDOWN}s)", _debug=True)
             return
         self._force_evaluate = False  # Clear flag before evaluating
 
-        responsive = {nid: ns for nid, ns in self.nodes.items() if ns.responsive}
+        nodes = self.nodes
+        responsive = {nid: nodes[nid] for nid in self._responsive_ids}
+        log = self.gateway.log  # Hoisted: called per node below
+        states = list(responsive.values())
         if not responsive:
-            self.gateway.log("[PM] skip: no responsive nodes", _debug=True)
+            log("[PM] skip: no responsive nodes", _debug=True)
             return
 
         budget = self.threshold_mw - self.HEADROOM_MW
         if budget <= 0:
-            self.gateway.log(f"[PM] skip: budget={budget:.0f} (threshold too low)",
-                             _debug=True)
+            log(f"[PM] skip: budget={budget:.0f} (threshold too low)", _debug=True)
             return
 
-        total_power = sum(ns.power for ns in responsive.values())
+        total_power = sum(ns.power for ns in states)
 
         # Log per-node state for debugging
-        for nid, ns in responsive.items():
-            self.gateway.log(
-                f"[PM] N{nid}: pwr={ns.power:.0f}mW, "
-                f"cmd_duty={ns.commanded_duty}%, tgt_duty={ns.target_duty}%, "
-                f"sensor_duty={ns.duty}%", _debug=True)
+        if debug:
+            for nid, ns in responsive.items():
+                log(
+                    f"[PM] N{nid}: pwr={ns.power:.0f}mW, "
+                    f"cmd_duty={ns.commanded_duty}%, tgt_duty={ns.target_duty}%, "
+                    f"sensor_duty={ns.duty}%", _debug=True)
 
         if not forced:
             # Dead band: skip if within 5% of budget (prevents constant jitter)
@@ -393,55 +573,59 @@ class PowerManager:
             # individual shares may need rebalancing even when total is fine
             deadband = budget * 0.05
             diff = abs(total_power - budget)
+            self._adapt_interval(diff / budget)
             if diff < deadband:
-                self.gateway.log(
-                    f"[PM] skip: deadband (total={total_power:.0f}, budget={budget:.0f}, "
-                    f"diff={diff:.0f} < band={deadband:.0f})", _debug=True)
+                if debug:
+                    log(
+                        f"[PM] skip: deadband (total={total_power:.0f}, budget={budget:.0f}, "
+                        f"diff={diff:.0f} < band={deadband:.0f})", _debug=True)
                 return
 
             # Skip if all nodes are at their ceiling and under budget
             all_at_ceiling = all(
                 (ns.target_duty > 0 and ns.commanded_duty >= ns.target_duty)
-                for ns in responsive.values()
+                for ns in states
             )
             # Also verify commanded duty matches actual sensor duty —
             # a mismatch means the node didn't receive the last command
             all_in_sync = all(
                 abs(ns.duty - ns.commanded_duty) <= 2  # 2% tolerance
-                for ns in responsive.values()
+                for ns in states
                 if ns.commanded_duty > 0
             )
             if all_at_ceiling and all_in_sync and total_power <= budget:
-                self.gateway.log(
-                    f"[PM] skip: all at ceiling, in sync & under budget "
-                    f"(total={total_power:.0f} <= {budget:.0f})", _debug=True)
+                if debug:
+                    log(
+                        f"[PM] skip: all at ceiling, in sync & under budget "
+                        f"(total={total_power:.0f} <= {budget:.0f})", _debug=True)
                 return
-            elif all_at_ceiling and not all_in_sync:
+            elif all_at_ceiling and not all_in_sync and debug:
                 # Nodes think they're at ceiling but actual duty disagrees
-                for ns in responsive.values():
+                for ns in states:
                     if ns.commanded_duty > 0 and abs(ns.duty - ns.commanded_duty) > 2:
-                        self.gateway.log(
+                        log(
                             f"[PM] N{ns.node_id} out of sync: "
                             f"cmd={ns.commanded_duty}% vs actual={ns.duty}%",
                             _debug=True)
         else:
-            self.gateway.log(f"[PM] forced re-evaluation (threshold/priority change)",
-                             _debug=True)
+            log("[PM] forced re-evaluation (threshold/priority change)", _debug=True)
+            self._current_interval = self.MIN_POLL_INTERVAL
             # Reset commanded_duty from actual sensor data to prevent
             # stale values from corrupting mw_per_pct estimates
-            for ns in responsive.values():
+            for ns in states:
+                ns.nudge_sig = ()  # Recompute every node this cycle
                 if ns.duty > 0:
                     old_cmd = ns.commanded_duty
                     ns.commanded_duty = ns.duty
-                    if abs(old_cmd - ns.duty) > 2:
-                        self.gateway.log(
+                    if debug and abs(old_cmd - ns.duty) > 2:
+                        log(
                             f"[PM] N{ns.node_id} reset cmd: {old_cmd}% -> {ns.duty}% (from sensor)",
                             _debug=True)
 
         direction = "▲ UP" if total_power < budget else "▼ DOWN"
-        self.gateway.log(
+        log(
             f"[POWER] {direction}: {total_power:.0f}/{budget:.0f}mW, "
-            f"nodes: {list(responsive.keys())}")
+            f"nodes: {[nid for nid in self._get_sorted_ids() if nid in responsive]}")
 
         self._adjusting = True
         try:
@@ -450,22 +634,48 @@ class PowerManager:
             else:
                 await self._balance_proportional(responsive, budget)
 
-            self._last_adjustment = time.monotonic()
+            self._start_cooldown()
         finally:
             self._adjusting = False
 
-    def _estimate_mw_per_pct(self, ns: NodeState, all_nodes: dict) -> float:
-        """Estimate milliwatts per duty% for a node.
+    def _adapt_interval(self, error: float):
+        """Adjust the poll interval from the relative budget error (AIMD-style).
 
-        Uses commanded_duty (what PM sent) instead of sensor-reported duty
-        to avoid oscillation from stale sensor data lagging PM commands.
+        Far from budget (>20%) the interval halves so corrections come
+        quickly; inside the 5% dead band it grows by 1.5x so a settled mesh
+        is polled less often.
+        """
+        interval = self._current_interval
+        if error > 0.2:
+            interval = max(self.MIN_POLL_INTERVAL, interval / 2)
+        elif error < 0.05:
+            interval = min(self.MAX_POLL_INTERVAL, interval * 1.5)
+        if interval != self._current_interval:
+            self._current_interval = interval
+            if self._debug_enabled:
+                self.gateway.log(f"[PM] poll interval {interval:.1f}s (error {error:.0%})",
+                                 _debug=True)
+
+    def _start_cooldown(self):
+        """Block non-forced adjustments for COOLDOWN seconds.
+
+        A single call_later timer sets _cooldown_done when the cooldown
+        expires, so evaluations just check the event instead of doing
+        clock arithmetic every cycle.
+        """
+        if self._cooldown_timer is not None:
+            self._cooldown_timer.cancel()
+        self._cooldown_done.clear()
+        self._cooldown_timer = asyncio.get_running_loop().call_later(
+            self.COOLDOWN, self._cooldown_done.set)
+
+    def _compute_cycle_avg(self, nodes: dict) -> float:
+        """Average mW/% over nodes that have data, for nodes that don't.
+
+        Computed once per balance cycle and passed to _estimate_mw_per_pct.
         """
-        duty_value = ns.commanded_duty if ns.commanded_duty > 0 else ns.duty
-        if duty_value > 0 and ns.power > 0:
-            return ns.power / duty_value
-        # Fallback: average from other nodes that have data
         estimates = []
-        for n in all_nodes.values():
+        for n in nodes.values():
             d = n.commanded_duty if n.commanded_duty > 0 else n.duty
             if d > 0 and n.power > 0:
                 estimates.append(n.power / d)
@@ -473,60 +683,176 @@ class PowerManager:
             return sum(estimates) / len(estimates)
         return 50.0  # Last resort default
 
-    async def _nudge_node(self, nid: str, ns: NodeState, target_share_mw: float,
-                          all_nodes: dict) -> str | None:
-        """Nudge a single node's duty toward its target power share.
+    def _estimate_mw_per_pct(self, ns: NodeState, fallback: float) -> float:
+        """Estimate milliwatts per duty% for a node.
 
-        Returns a change description string, or None if no change needed.
-        Sends the duty command once — retries happen on the next poll cycle
-        instead of blocking here (which caused cascading delays).
+        Uses commanded_duty (what PM sent) instead of sensor-reported duty
+        to avoid oscillation from stale sensor data lagging PM commands.
+        Falls back to the cycle average when the node has no data yet.
         """
-        mw_per_pct = self._estimate_mw_per_pct(ns, all_nodes)
-        ideal_duty = target_share_mw / mw_per_pct
-
-        # Clamp to [0, target_duty] — never exceed user's original setting
-        ceiling = ns.target_duty if ns.target_duty > 0 else 100
-        ideal_duty_clamped = max(0, min(ceiling, ideal_duty))
-
-        current = ns.commanded_duty if ns.commanded_duty > 0 else ns.duty
-        new_duty = round(ideal_duty_clamped)
-
-        self.gateway.log(
-            f"[PM] nudge N{nid}: share={target_share_mw:.0f}mW, "
-            f"mw/pct={mw_per_pct:.1f}, ideal={ideal_duty:.1f}%, "
-            f"ceiling={ceiling}%, clamped={new_duty}%, current={current}%",
-            _debug=True)
+        duty_value = ns.commanded_duty if ns.commanded_duty > 0 else ns.duty
+        if duty_value > 0 and ns.power > 0:
+            return ns.power / duty_value
+        return fallback
+
+    def _power_caps(self, nodes: dict, fallback: float) -> dict[str, float]:
+        """Max power (mW) each node can draw at its duty ceiling."""
+        estimate = self._estimate_mw_per_pct
+        return {
+            nid: (ns.target_duty if ns.target_duty > 0 else 100) * estimate(ns, fallback)
+            for nid, ns in nodes.items()
+        }
+
+    def _compute_new_duties(self, nodes: dict, shares: dict[str, float],
+                            fallback: float) -> dict[str, tuple[int, int]]:
+        """Work out the duty each node should move to for its power share.
+
+        One pass over the nodes in id order; returns {nid: (current, new_duty)}
+        for only the nodes whose duty actually changes, so the balancers
+        send commands for those and skip everything else.
+
+        The unrounded duty is kept in commanded_duty_f; a node is only
+        re-sent once its ideal moves at least half a percent from that, so
+        an ideal hovering around x.5 doesn't flip the duty every cycle.
+        A node whose inputs match the last cycle that left it unchanged
+        (ns.nudge_sig) is skipped before any of that arithmetic.
+        """
+        log = self.gateway.log
+        debug = self._debug_enabled
+        estimate = self._estimate_mw_per_pct
+        changes = {}
+        for nid in self._get_sorted_ids():
+            if nid not in shares:
+                continue
+            ns = nodes[nid]
+            share_mw = shares[nid]
+            mw_per_pct = estimate(ns, fallback)
+            ceiling = ns.target_duty if ns.target_duty > 0 else 100
+            current = ns.commanded_duty if ns.commanded_duty > 0 else ns.duty
+            sig = (round(mw_per_pct * 10), ceiling, round(share_mw), current)
+            if sig == ns.nudge_sig:
+                continue  # Same inputs as last time, which needed no change
+            ideal_duty = share_mw / mw_per_pct
+
+            # Clamp to [0, target_duty] — never exceed user's original setting
+            ideal_clamped = max(0.0, min(ceiling, 100, ideal_duty))
+            new_duty = round(ideal_clamped)
+            # Fractional duty behind `current`, unless something else
+            # (user command, forced reset) has changed the duty since
+            prev_f = ns.commanded_duty_f
+            if round(prev_f) != current:
+                prev_f = current
+
+            if debug:
+                log(f"[PM] nudge N{nid}: share={share_mw:.0f}mW, "
+                    f"mw/pct={mw_per_pct:.1f}, ideal={ideal_duty:.1f}%, "
+                    f"ceiling={ceiling}%, clamped={new_duty}%, current={current}%",
+                    _debug=True)
+
+            if new_duty != current and abs(ideal_clamped - prev_f) >= 0.5:
+                ns.commanded_duty_f = ideal_clamped
+                changes[nid] = (current, new_duty)
+                ns.nudge_sig = ()
+            else:
+                ns.nudge_sig = sig
+        return changes
 
-        if new_duty == current:
-            return None
+    async def _send_duties(self, nodes: dict,
+                           new_duties: dict[str, tuple[int, int]]) -> list[str]:
+        """Send every duty change from _compute_new_duties; return change strings.
 
-        new_duty = max(0, min(100, new_duty))
-        if new_duty == current:
-            return None
+        When every tracked node moves to the same duty, one ALL:DUTY group
+        send replaces N unicast sends. Otherwise the unicast sends go out
+        staggered across READ_STAGGER (like discovery probes) and their
+        confirmations are awaited together rather than one after another.
+        """
+        if not new_duties:
+            return []
+        duties = {new for _, new in new_duties.values()}
+        if (len(new_duties) > 1 and len(duties) == 1
+                and new_duties.keys() == self.nodes.keys()):
+            return await self._send_group_duty(nodes, new_duties, duties.pop())
+        stagger = self.READ_STAGGER / len(new_duties)
+        return await asyncio.gather(*(
+            self._nudge_node(nid, nodes[nid], current, new_duty, i * stagger)
+            for i, (nid, (current, new_duty)) in enumerate(new_duties.items())))
+
+    async def _send_group_duty(self, nodes: dict,
+                               new_duties: dict[str, tuple[int, int]],
+                               duty: int) -> list[str]:
+        """Set one duty on every node with a single ALL:DUTY group send."""
+        gw = self.gateway
+        ids = list(new_duties)
+        # Every waiter is registered before the last one performs the send
+        waits = [gw._wait_node_response(nid) for nid in ids[:-1]]
+        waits.append(gw._wait_node_response(
+            ids[-1], send=gw.set_duty("ALL", duty, _from_power_mgr=True, _silent=True)))
+        async with self._tracked():
+            confirmed = await asyncio.gather(*waits)
+        debug = self._debug_enabled
+        if debug:
+            gw.log(f"[PM] ALL duty:{duty}% (group send)", _debug=True)
 
+        changes = []
+        for nid, ok in zip(ids, confirmed):
+            nodes[nid].commanded_duty = duty
+            changes.append(f"N{nid}:{new_duties[nid][0]}->{duty}%")
+            if debug and not ok:
+                gw.log(f"[PM] N{nid} duty:{duty}% sent (no confirm, will verify next poll)",
+                       _debug=True)
+        return changes
+
+    async def _nudge_node(self, nid: str, ns: NodeState, current: int,
+                          new_duty: int, delay: float = 0.0) -> str:
+        """Send a node its new duty and return a change description string.
+
+        Sends the duty command once (after `delay`) — retries happen on the
+        next poll cycle instead of blocking here (which caused cascading delays).
+        """
+        async with self._tracked():
+            if delay:
+                await asyncio.sleep(delay)
+            gw = self.gateway
+            confirmed = await gw._wait_node_response(
+                nid, send=gw.set_duty(nid, new_duty, _from_power_mgr=True, _silent=True))
         change = f"N{nid}:{current}->{new_duty}%"
-        await self.gateway.set_duty(nid, new_duty, _from_power_mgr=True, _silent=True)
-        confirmed = await self.gateway._wait_node_response(nid)
         # Always update commanded_duty — with mesh latency, strict confirmation
         # often fails (response shows old duty). The next poll will self-correct
         # if the command was truly lost.
         ns.commanded_duty = new_duty
-        if not confirmed:
+        if self._debug_enabled and not confirmed:
             self.gateway.log(
                 f"[PM] N{nid} duty:{new_duty}% sent (no confirm, will verify next poll)",
                 _debug=True)
         return change
 
+    def _broadcast_pm_update(self, total_power: float, budget: float, changes: list):
+        """Web broadcast: PM state update after a balance pass."""
+        gw = self.gateway
+        if getattr(gw, '_web_enabled', False):
+            try:
+                if gw.ble_thread:
+                    gw.ble_thread.submit_nowait(
+                        gw._web.broadcast_state_change("pm_update", {
+                            "total_power": total_power,
+                            "budget": budget,
+                            "changes": changes,
+                        })
+                    )
+                    # New targets/commanded duties; unchanged fields are elided
+                    gw.ble_thread.submit_nowait(
+                        gw._web.broadcast_state_delta(list(self.nodes)))
+            except Exception:
+                pass
+
     async def _balance_proportional(self, nodes: dict, budget: float):
-        """Equal power shares: each node gets budget/N."""
-        n = len(nodes)
-        share_mw = budget / n
+        """Equal power shares: each node gets budget/N, water-filled past capped nodes."""
+        fallback = self._compute_cycle_avg(nodes)
+        shares, share_mw = _water_fill(budget, self._power_caps(nodes, fallback),
+                                       dict.fromkeys(nodes, 1.0))
 
-        changes = []
-        for nid, ns in sorted(nodes.items(), key=lambda x: int(x[0]) if x[0].isdigit() else 999):
-            change = await self._nudge_node(nid, ns, share_mw, nodes)
-            if change:
-                changes.append(change)
+        new_duties = self._compute_new_duties(nodes, shares, fallback)
+        changes = await self._send_duties(nodes, new_duties)
 
         total_power = sum(ns.power for ns in nodes.values())
         if changes:
@@ -534,58 +860,29 @@ class PowerManager:
                 f"[POWER] Balancing {total_power:.0f}/{budget:.0f}mW "
                 f"(share:{share_mw:.0f}mW each) — {', '.join(changes)}")
 
-        # Web broadcast: PM state update
-        if getattr(self.gateway, '_web_enabled', False):
-            try:
-                import web_server
-                loop = self.gateway.ble_thread._loop if self.gateway.ble_thread else None
-                if loop:
-                    asyncio.run_coroutine_threadsafe(
-                        web_server.broadcast_state_change("pm_update", {
-                            "total_power": total_power,
-                            "budget": budget,
-                            "changes": changes,
-                        }),
-                        loop
-                    )
-            except Exception:
-                pass
+        self._broadcast_pm_update(total_power, budget, changes)
 
     async def _balance_with_priority(self, nodes: dict, budget: float):
         """Weighted power shares: priority node gets PRIORITY_WEIGHT x normal share."""
-        priority_ns = nodes[self.priority_node]
-        non_priority = {nid: ns for nid, ns in nodes.items()
-                        if nid != self.priority_node}
-
-        # Calculate weighted shares
-        total_shares = self.PRIORITY_WEIGHT + len(non_priority)
-        priority_budget = budget * (self.PRIORITY_WEIGHT / total_shares)
-
-        # If priority can't use its full share (limited by target_duty), redistribute
-        pri_mw_per_pct = self._estimate_mw_per_pct(priority_ns, nodes)
-        pri_ceiling = priority_ns.target_duty if priority_ns.target_duty > 0 else 100
-        pri_max_power = pri_ceiling * pri_mw_per_pct
-        if pri_max_power < priority_budget and non_priority:
-            # Priority can't fill its share — surplus goes to non-priority
-            priority_budget = pri_max_power
-            remaining = budget - priority_budget
-        else:
-            remaining = budget - priority_budget
-
-        non_pri_share = remaining / len(non_priority) if non_priority else 0
-
-        changes = []
-        # Nudge priority node
-        change = await self._nudge_node(self.priority_node, priority_ns,
-                                        priority_budget, nodes)
-        if change:
-            changes.append(change + "(pri)")
-
-        # Nudge non-priority nodes
-        for nid, ns in sorted(non_priority.items(), key=lambda x: int(x[0]) if x[0].isdigit() else 999):
-            change = await self._nudge_node(nid, ns, non_pri_share, nodes)
-            if change:
-                changes.append(change)
+        weights = dict.fromkeys(nodes, 1.0)
+        weights[self.priority_node] = self.PRIORITY_WEIGHT
+
+        # If the priority node (or any other) can't use its full share
+        # because of its target_duty, the surplus is redistributed
+        fallback = self._compute_cycle_avg(nodes)
+        shares, non_pri_share = _water_fill(budget, self._power_caps(nodes, fallback),
+                                            weights)
+        priority_budget = shares[self.priority_node]
+
+        new_duties = self._compute_new_duties(nodes, shares, fallback)
+
+        # Priority node goes first
+        pri_change = new_duties.pop(self.priority_node, None)
+        if pri_change:
+            new_duties = {self.priority_node: pri_change, **new_duties}
+        changes = await self._send_duties(nodes, new_duties)
+        if self.priority_node in new_duties:
+            changes[0] += "(pri)"
 
         total_power = sum(ns.power for ns in nodes.values())
         if changes:
@@ -594,19 +891,4 @@ class PowerManager:
                 f"(pri:{priority_budget:.0f}mW, others:{non_pri_share:.0f}mW each) "
                 f"— {', '.join(changes)}")
 
-        # Web broadcast: PM state update
-        if getattr(self.gateway, '_web_enabled', False):
-            try:
-                import web_server
-                loop = self.gateway.ble_thread._loop if self.gateway.ble_thread else None
-                if loop:
-                    asyncio.run_coroutine_threadsafe(
-                        web_server.broadcast_state_change("pm_update", {
-                            "total_power": total_power,
-                            "budget": budget,
-                            "changes": changes,
-                        }),
-                        loop
-                    )
-            except Exception:
-                pass
+        self._broadcast_pm_update(total_power, budget, changes)
@@ -1,6 +1,9 @@
 """Textual TUI application for the DC Monitor Mesh Gateway."""
 
 import asyncio
+import concurrent.futures
+import sys
+from typing import Optional
 
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, Vertical
@@ -9,14 +12,53 @@ from textual.widgets import Header, Footer, Input, RichLog, DataTable, Static
 from textual import work, on
 
 from ble_thread import BleThread
-from dc_gateway import DCMonitorGateway
+from dc_gateway import DCMonitorGateway, find_device
 from power_manager import PowerManager
 
 
+# Shown by the "help" command
+_HELP_TEXT = (
+    "[bold]--- Commands ---[/bold]\n"
+    "  node <id>      Switch target (0-9 or ALL)\n"
+    "  ramp / r       Send RAMP to target node\n"
+    "  stop / s       Send STOP to target node\n"
+    "  duty <0-100>   Set duty cycle on target node\n"
+    "  status         Get status from target node\n"
+    "  read           Single sensor reading\n"
+    "  monitor / m    Start continuous monitoring\n"
+    "  raw <cmd>      Send raw command string\n"
+    "\n"
+    "[bold]--- Power Management ---[/bold]\n"
+    "  threshold <mW> Set total power limit\n"
+    "  priority <id>  Set priority node\n"
+    "  threshold off  Disable power management\n"
+    "  priority off   Clear priority node\n"
+    "  power          Show power manager status\n"
+    "\n"
+    "[bold]--- Polling ---[/bold]\n"
+    "  poll <sec>     Start/adjust poll interval\n"
+    "  poll stop      Stop polling\n"
+    "  poll show      Display latest readings\n"
+    "  poll show on   Show poll data in log\n"
+    "  poll show off  Hide poll data from log\n"
+    "\n"
+    "[bold]--- Keys / Misc ---[/bold]\n"
+    "  debug / d      Toggle debug mode (or F2)\n"
+    "  clear / cls    Clear log (or F3)\n"
+    "  Esc            Focus input\n"
+    "  q / quit       Quit"
+)
+
+
 class MeshGatewayApp(App):
     """Textual TUI for the BLE Mesh Gateway."""
 
     TITLE = "DC Monitor Mesh Gateway"
+    LOG_MAX_LINES = 2000  # RichLog history cap (older lines are dropped)
+    TEARDOWN_TIMEOUT = 1.0  # Seconds each exit step (disconnect, BLE thread join) may take
+    # First words of commands that send to the target node (response tracking)
+    _BLE_CMDS = frozenset({'stop', 's', 'ramp', 'r', 'status', 'read',
+                           'monitor', 'm', 'duty', 'raw'})
 
     CSS = """
     #sidebar {
@@ -48,20 +90,6 @@ class MeshGatewayApp(App):
 
     # ---- Custom Messages ----
 
-    class SensorDataMsg(Message):
-        """Sensor data arrived from a mesh node."""
-        def __init__(self, node_id: str, duty: int, voltage: float,
-                     current: float, power: float, raw: str,
-                     is_user_response: bool = False):
-            super().__init__()
-            self.node_id = node_id
-            self.duty = duty
-            self.voltage = voltage
-            self.current = current
-            self.power = power
-            self.raw = raw
-            self.is_user_response = is_user_response
-
     class LogMsg(Message):
         """Generic log line for the RichLog panel."""
         def __init__(self, text: str, style: str = ""):
@@ -81,14 +109,44 @@ class MeshGatewayApp(App):
                  default_node: str = "0", scan_timeout: float = 10.0):
         super().__init__()
         self.gateway = gateway
-        self.gateway.app = self  # Back-reference for callbacks
+        self.gateway.attach_app(self)  # Back-reference for callbacks
         self.gateway.target_node = default_node
         self.target_address = target_address
         self.scan_timeout = scan_timeout
         self.debug_mode = False
         self._connected = False
+        self._node_col_keys = []  # Column keys of #nodes-table, set in on_mount
+        self._last_row: dict[str, tuple] = {}  # Last values written per row key
+        self._log_buf: list[str] = []  # Log lines written on the next _flush_pending
+        # Widgets looked up once in on_mount (hot paths skip query_one)
+        self._table: Optional[DataTable] = None
+        self._log_view: Optional[RichLog] = None
+        self._sidebar: Optional[Static] = None
+        self._cmd_input: Optional[Input] = None
+        self._last_sidebar = ""  # Sidebar markup last passed to Static.update
         self._ble_thread = BleThread()
         self.gateway.ble_thread = self._ble_thread
+        # dispatch_command tables: whole-command matches, then first-word prefixes
+        self._cmd_table = {
+            'q': self._cmd_quit, 'quit': self._cmd_quit, 'exit': self._cmd_quit,
+            's': self._cmd_stop, 'stop': self._cmd_stop,
+            'r': self._cmd_ramp, 'ramp': self._cmd_ramp,
+            'status': self._cmd_status,
+            'read': self._cmd_read,
+            'm': self._cmd_monitor, 'monitor': self._cmd_monitor,
+            'power': self._cmd_power,
+            'd': self._cmd_debug, 'debug': self._cmd_debug,
+            'clear': self._cmd_clear, 'cls': self._cmd_clear,
+            'help': self._cmd_help,
+        }
+        self._prefix_table = {
+            'node': self._cmd_node,
+            'duty': self._cmd_duty,
+            'raw': self._cmd_raw,
+            'threshold': self._cmd_threshold,
+            'priority': self._cmd_priority,
+            'poll': self._cmd_poll,
+        }
 
     # ---- Layout ----
 
@@ -96,30 +154,33 @@ class MeshGatewayApp(App):
         yield Header()
         with Horizontal():
             yield Static("Connecting...", id="sidebar")
-            yield RichLog(id="log", wrap=True, highlight=True, markup=True)
+            yield RichLog(id="log", wrap=True, highlight=True, markup=True,
+                          max_lines=self.LOG_MAX_LINES)
         yield DataTable(id="nodes-table")
         yield Input(placeholder="Enter command (type 'help' for list)", id="cmd-input")
         yield Footer()
 
     def on_mount(self) -> None:
         """Initialize table and start BLE connection."""
-        table = self.query_one("#nodes-table", DataTable)
-        table.add_columns("ID", "Duty", "Target", "Voltage", "Current", "Power", "Status")
+        self._table = table = self.query_one("#nodes-table", DataTable)
+        self._log_view = self.query_one("#log", RichLog)
+        self._sidebar = self.query_one("#sidebar", Static)
+        self._cmd_input = self.query_one("#cmd-input", Input)
+        self._node_col_keys = table.add_columns(
+            "ID", "Duty", "Target", "Voltage", "Current", "Power", "Status")
         table.cursor_type = "none"
         # Focus the input
-        self.query_one("#cmd-input", Input).focus()
+        self._cmd_input.focus()
         # Start BLE I/O thread before any BLE operations
         self._ble_thread.start()
+        # Apply queued sensor readings in one batch at ~15 Hz
+        self.set_interval(1 / 15, self._flush_pending)
 
         # Start web server on BLE thread if --web flag was set
         if getattr(self.gateway, '_web_enabled', False):
             try:
-                import uvicorn
                 import web_server
-                config = uvicorn.Config(
-                    web_server.app, host="0.0.0.0",
-                    port=self.gateway._web_port, log_level="info")
-                server = uvicorn.Server(config)
+                server = web_server.create_server(self.gateway._web_port)
                 self._ble_thread.submit(server.serve())
                 self.log_message(
                     f"Web dashboard: http://0.0.0.0:{self.gateway._web_port}",
@@ -148,10 +209,7 @@ class MeshGatewayApp(App):
 
         # Build ordered device list: target address first (if given), then the rest
         if self.target_address:
-            target_dev = next(
-                (d for d in devices if d.address.upper() == self.target_address.upper()),
-                None,
-            )
+            target_dev = find_device(devices, self.target_address)
             ordered = ([target_dev] if target_dev else []) + [
                 d for d in devices if d != target_dev
             ]
@@ -196,178 +254,191 @@ class MeshGatewayApp(App):
 
     @work(exclusive=True, group="cmd")
     async def dispatch_command(self, cmd: str) -> None:
-        """Parse and execute a user command via BLE thread."""
+        """Parse and execute a user command via BLE thread.
+
+        Whole-command matches come from _cmd_table; otherwise the first word
+        is looked up in _prefix_table and its handler gets the rest (or None).
+        """
         gw = self.gateway
-        bt = self._ble_thread
         # Preempt poll so user command takes priority
         if hasattr(gw, '_poll_interrupt'):
             gw._poll_interrupt.set()
         # Mark target for user response tracking on BLE-sending commands
-        first_word = cmd.split()[0] if cmd else ''
-        _ble_cmds = {'stop', 's', 'ramp', 'r', 'status', 'read', 'monitor', 'm'}
-        if first_word in _ble_cmds or cmd.startswith('duty') or cmd.startswith('raw') or first_word.isdigit():
+        parts = cmd.split(None, 1)
+        first_word = parts[0] if parts else ''
+        if first_word in self._BLE_CMDS or first_word.isdigit():
             if hasattr(gw, 'mark_user_command'):
                 gw.mark_user_command(gw.target_node)
         try:
-            if cmd in ['q', 'quit', 'exit']:
-                if gw._power_manager:
-                    await bt.submit_async(gw._power_manager.disable())
-                await bt.submit_async(gw.disconnect())
-                bt.stop()
-                self.exit()
-
-            elif cmd.startswith('node'):
-                parts = cmd.split(None, 1)
-                if len(parts) < 2:
-                    self.log_message("Usage: node <0-9 or ALL>")
-                    return
-                new_node = parts[1].strip().upper()
-                if new_node == 'ALL' or (new_node.isdigit() and 0 <= int(new_node) <= 9):
-                    gw.target_node = new_node.lower() if new_node != 'ALL' else 'ALL'
-                    self.log_message(f"Target node: {gw.target_node}")
-                else:
-                    self.log_message("Invalid node ID (use 0-9 or ALL)")
+            handler = self._cmd_table.get(cmd)
+            if handler is not None:
+                await handler()
+            elif cmd.isdigit():
+                await self._ble_thread.submit_async(gw.set_duty(gw.target_node, int(cmd)))
+            elif first_word in self._prefix_table:
+                await self._prefix_table[first_word](parts[1].strip() if len(parts) > 1 else None)
+            else:
+                self.log_message("Unknown command. Type 'help' for list.")
 
-            elif cmd in ['s', 'stop']:
-                was_monitoring = gw._monitoring
-                await bt.submit_async(gw.stop_node(gw.target_node))
-                if was_monitoring:
-                    self.log_message("Monitoring stopped")
+        except (ValueError, IndexError):
+            self.log_message("Invalid value or missing argument")
+        except Exception as e:
+            self.log_message(f"Error: {e}", style="bold red")
 
-            elif cmd in ['r', 'ramp']:
-                await bt.submit_async(gw.start_ramp(gw.target_node))
+        self.update_status()
 
-            elif cmd == 'status':
-                await bt.submit_async(gw.read_status(gw.target_node))
+    # ---- Command Handlers (see _cmd_table / _prefix_table) ----
 
-            elif cmd == 'read':
-                await bt.submit_async(gw.read_sensor(gw.target_node))
+    async def _cmd_quit(self) -> None:
+        gw = self.gateway
+        bt = self._ble_thread
+        if gw._power_manager:
+            await bt.submit_async(gw._power_manager.disable())
+        await bt.submit_async(gw.disconnect())
+        bt.stop()
+        self.exit()
 
-            elif cmd in ['m', 'monitor']:
-                await bt.submit_async(gw.start_monitor(gw.target_node))
+    async def _cmd_stop(self) -> None:
+        gw = self.gateway
+        was_monitoring = gw._monitoring
+        await self._ble_thread.submit_async(gw.stop_node(gw.target_node))
+        if was_monitoring:
+            self.log_message("Monitoring stopped")
 
-            elif cmd.startswith('duty'):
-                parts = cmd.split(None, 1)
-                if len(parts) < 2:
-                    self.log_message("Usage: duty <0-100>")
-                    return
-                val = int(parts[1])
-                if val < 0 or val > 100:
-                    self.log_message(f"Note: duty clamped to {max(0, min(100, val))}%")
-                await bt.submit_async(gw.set_duty(gw.target_node, val))
+    async def _cmd_ramp(self) -> None:
+        gw = self.gateway
+        await self._ble_thread.submit_async(gw.start_ramp(gw.target_node))
 
-            elif cmd.isdigit():
-                await bt.submit_async(gw.set_duty(gw.target_node, int(cmd)))
-
-            elif cmd.startswith('raw'):
-                parts = cmd.split(None, 1)
-                if len(parts) < 2:
-                    self.log_message("Usage: raw <command>")
-                    return
-                await bt.submit_async(gw.send_command(parts[1].upper()))
-
-            elif cmd.startswith('threshold'):
-                parts = cmd.split(None, 1)
-                if len(parts) < 2:
-                    self.log_message("Usage: threshold <mW> or threshold off")
-                    return
-                arg = parts[1].strip()
-                if arg == 'off':
-                    if gw._power_manager:
-                        await bt.submit_async(gw._power_manager.disable())
-                        self.workers.cancel_group(self, "power_poll")
-                        self.notify("Threshold disabled", severity="information")
-                else:
-                    mw = float(arg)
-                    if not gw._power_manager:
-                        gw._power_manager = PowerManager(gw)
-                    gw._power_manager.set_threshold(mw)
-                    self.start_power_poll()
-                    self.notify(f"Threshold: {mw:.0f} mW", severity="information")
-
-            elif cmd.startswith('priority'):
-                parts = cmd.split(None, 1)
-                if len(parts) < 2:
-                    self.log_message("Usage: priority <node_id> or priority off")
-                    return
-                arg = parts[1].strip()
-                if arg == 'off':
-                    if gw._power_manager:
-                        gw._power_manager.clear_priority()
-                        self.notify("Priority cleared", severity="information")
-                elif gw._power_manager:
-                    if not (arg.isdigit() and 0 <= int(arg) <= 9):
-                        self.log_message(f"Warning: '{arg}' may not be a valid node ID (expected 0-9)")
-                    gw._power_manager.set_priority(arg)
-                    self.notify(f"Priority: node {arg}", severity="information")
-                else:
-                    self.log_message("Set a threshold first")
+    async def _cmd_status(self) -> None:
+        gw = self.gateway
+        await self._ble_thread.submit_async(gw.read_status(gw.target_node))
 
-            elif cmd == 'power':
-                if gw._power_manager:
-                    self.log_message(gw._power_manager.status())
-                else:
-                    self.log_message("Power management not active. Use: threshold <mW>")
-
-            elif cmd.startswith('poll'):
-                parts = cmd.split(None, 1)
-                if len(parts) < 2:
-                    # Show poll status
-                    if gw._web_poll_requested:
-                        active = gw._web_poll_task and not gw._web_poll_task.done()
-                        status = "active" if active else "requested (deferred)"
-                        self.log_message(f"Polling: {status} ({gw._web_poll_interval}s)")
-                    else:
-                        self.log_message("Polling: stopped")
-                else:
-                    arg = parts[1].strip()
-                    if arg in ('stop', 'off'):
-                        await bt.submit_async(gw.stop_web_poll())
-                        self.log_message("Polling stopped")
-                    elif arg.startswith('show'):
-                        show_parts = arg.split(None, 1)
-                        if len(show_parts) >= 2 and show_parts[1] in ('on', 'true', '1'):
-                            gw._poll_show_log = True
-                            self.log_message("Poll data: now visible in log")
-                        elif len(show_parts) >= 2 and show_parts[1] in ('off', 'false', '0'):
-                            gw._poll_show_log = False
-                            self.log_message("Poll data: hidden from log")
-                        else:
-                            # Display latest readings without sending BLE command
-                            if gw._last_readings:
-                                for nid, r in sorted(gw._last_readings.items()):
-                                    self.log_message(
-                                        f"  Node {nid}: D:{r['duty']}% "
-                                        f"V:{r['voltage']:.3f}V "
-                                        f"I:{r['current']:.2f}mA "
-                                        f"P:{r['power']:.1f}mW")
-                            else:
-                                self.log_message("No poll data yet")
-                    else:
-                        try:
-                            interval = float(arg)
-                            await bt.submit_async(gw.start_web_poll(interval))
-                        except ValueError:
-                            self.log_message(f"Usage: poll <seconds> | poll stop | poll show")
-
-            elif cmd in ['d', 'debug']:
-                self.action_toggle_debug()
-
-            elif cmd in ['clear', 'cls']:
-                self.action_clear_log()
-
-            elif cmd == 'help':
-                self._show_help()
+    async def _cmd_read(self) -> None:
+        gw = self.gateway
+        await self._ble_thread.submit_async(gw.read_sensor(gw.target_node))
 
-            else:
-                self.log_message("Unknown command. Type 'help' for list.")
+    async def _cmd_monitor(self) -> None:
+        gw = self.gateway
+        await self._ble_thread.submit_async(gw.start_monitor(gw.target_node))
 
-        except (ValueError, IndexError):
-            self.log_message("Invalid value or missing argument")
-        except Exception as e:
-            self.log_message(f"Error: {e}", style="bold red")
+    async def _cmd_power(self) -> None:
+        gw = self.gateway
+        if gw._power_manager:
+            self.log_message(gw._power_manager.status())
+        else:
+            self.log_message("Power management not active. Use: threshold <mW>")
 
-        self.update_status()
+    async def _cmd_debug(self) -> None:
+        self.action_toggle_debug()
+
+    async def _cmd_clear(self) -> None:
+        self.action_clear_log()
+
+    async def _cmd_help(self) -> None:
+        self._show_help()
+
+    async def _cmd_node(self, arg: Optional[str]) -> None:
+        gw = self.gateway
+        if arg is None:
+            self.log_message("Usage: node <0-9 or ALL>")
+            return
+        new_node = arg.upper()
+        if new_node == 'ALL' or (new_node.isdigit() and 0 <= int(new_node) <= 9):
+            gw.target_node = new_node.lower() if new_node != 'ALL' else 'ALL'
+            self.log_message(f"Target node: {gw.target_node}")
+        else:
+            self.log_message("Invalid node ID (use 0-9 or ALL)")
+
+    async def _cmd_duty(self, arg: Optional[str]) -> None:
+        gw = self.gateway
+        if arg is None:
+            self.log_message("Usage: duty <0-100>")
+            return
+        val = int(arg)
+        if val < 0 or val > 100:
+            self.log_message(f"Note: duty clamped to {max(0, min(100, val))}%")
+        await self._ble_thread.submit_async(gw.set_duty(gw.target_node, val))
+
+    async def _cmd_raw(self, arg: Optional[str]) -> None:
+        if arg is None:
+            self.log_message("Usage: raw <command>")
+            return
+        await self._ble_thread.submit_async(self.gateway.send_command(arg.upper()))
+
+    async def _cmd_threshold(self, arg: Optional[str]) -> None:
+        gw = self.gateway
+        if arg is None:
+            self.log_message("Usage: threshold <mW> or threshold off")
+            return
+        if arg == 'off':
+            if gw._power_manager:
+                await self._ble_thread.submit_async(gw._power_manager.disable())
+                self.workers.cancel_group(self, "power_poll")
+                self.notify("Threshold disabled", severity="information")
+        else:
+            mw = float(arg)
+            if not gw._power_manager:
+                gw._power_manager = PowerManager(gw)
+            gw._power_manager.set_threshold(mw)
+            self.start_power_poll()
+            self.notify(f"Threshold: {mw:.0f} mW", severity="information")
+
+    async def _cmd_priority(self, arg: Optional[str]) -> None:
+        gw = self.gateway
+        if arg is None:
+            self.log_message("Usage: priority <node_id> or priority off")
+            return
+        if arg == 'off':
+            if gw._power_manager:
+                gw._power_manager.clear_priority()
+                self.notify("Priority cleared", severity="information")
+        elif gw._power_manager:
+            if not (arg.isdigit() and 0 <= int(arg) <= 9):
+                self.log_message(f"Warning: '{arg}' may not be a valid node ID (expected 0-9)")
+            gw._power_manager.set_priority(arg)
+            self.notify(f"Priority: node {arg}", severity="information")
+        else:
+            self.log_message("Set a threshold first")
+
+    async def _cmd_poll(self, arg: Optional[str]) -> None:
+        gw = self.gateway
+        bt = self._ble_thread
+        if arg is None:
+            # Show poll status
+            if gw._web_poll_requested:
+                active = gw._web_poll_task and not gw._web_poll_task.done()
+                status = "active" if active else "requested (deferred)"
+                self.log_message(f"Polling: {status} ({gw._web_poll_interval}s)")
+            else:
+                self.log_message("Polling: stopped")
+        elif arg in ('stop', 'off'):
+            await bt.submit_async(gw.stop_web_poll())
+            self.log_message("Polling stopped")
+        elif arg.startswith('show'):
+            show_parts = arg.split(None, 1)
+            if len(show_parts) >= 2 and show_parts[1] in ('on', 'true', '1'):
+                gw._poll_show_log = True
+                self.log_message("Poll data: now visible in log")
+            elif len(show_parts) >= 2 and show_parts[1] in ('off', 'false', '0'):
+                gw._poll_show_log = False
+                self.log_message("Poll data: hidden from log")
+            else:
+                # Display latest readings without sending BLE command
+                if gw._last_readings:
+                    for nid, r in sorted(gw._last_readings.items()):
+                        self.log_message(
+                            f"  Node {nid}: D:{r['duty']}% "
+                            f"V:{r['voltage']:.3f}V "
+                            f"I:{r['current']:.2f}mA "
+                            f"P:{r['power']:.1f}mW")
+                else:
+                    self.log_message("No poll data yet")
+        else:
+            try:
+                interval = float(arg)
+                await bt.submit_async(gw.start_web_poll(interval))
+            except ValueError:
+                self.log_message(f"Usage: poll <seconds> | poll stop | poll show")
 
     # ---- Power Poll Worker ----
 
@@ -387,26 +458,40 @@ class MeshGatewayApp(App):
     # Textual auto-discovers handlers named on_<namespace>_<message_name>
     # where namespace = snake_case of outermost widget class.
 
-    def on_mesh_gateway_app_sensor_data_msg(self, msg: SensorDataMsg) -> None:
-        """Handle incoming sensor data — update table and optionally log."""
-        self._update_node_table(msg)
-        self.update_status()
-
-        # Show in log if: user-triggered response, poll_show_log enabled, or debug mode
-        show_in_log = (msg.is_user_response
-                       or getattr(self.gateway, '_poll_show_log', False)
-                       or self.debug_mode)
-        if show_in_log:
-            log = self.query_one("#log", RichLog)
-            log.write(msg.raw)
+    def _flush_pending(self) -> None:
+        """Apply every reading the BLE thread queued since the last tick.
+
+        Runs on the app's own loop (set_interval), so no message hop is
+        needed. Table rows only take each node's newest reading, and the
+        sidebar is refreshed once per tick rather than once per packet.
+        """
+        pending = self.gateway._pending_ui
+        buf = self._log_buf
+        if pending:
+            # Show in log if: user-triggered response, poll_show_log enabled, or debug mode
+            show_all = (getattr(self.gateway, '_poll_show_log', False)
+                        or self.debug_mode)
+            latest = {}
+            for _ in range(len(pending)):
+                reading = pending.popleft()
+                latest[reading[0]] = reading
+                # Every user-triggered line is kept, even if superseded
+                if show_all or reading[6]:
+                    buf.append(reading[5])
+            for reading in latest.values():
+                self._update_node_table(*reading[:5])
+            self.update_status()
+        if buf:
+            # One write (one re-layout) for everything logged this tick
+            self._log_view.write("\n".join(buf))
+            buf.clear()
 
     def on_mesh_gateway_app_log_msg(self, msg: LogMsg) -> None:
-        """Handle generic log messages."""
-        log = self.query_one("#log", RichLog)
+        """Handle generic log messages (written on the next flush tick)."""
         if msg.style:
-            log.write(f"[{msg.style}]{msg.text}[/{msg.style}]")
+            self._log_buf.append(f"[{msg.style}]{msg.text}[/{msg.style}]")
         else:
-            log.write(msg.text)
+            self._log_buf.append(msg.text)
 
     def on_mesh_gateway_app_power_adjust_msg(self, msg: PowerAdjustMsg) -> None:
         """Handle power adjustment notification."""
@@ -414,39 +499,41 @@ class MeshGatewayApp(App):
 
     # ---- UI Updates ----
 
-    def _update_node_table(self, msg: SensorDataMsg) -> None:
+    def _update_node_table(self, node_id: str, duty: int, voltage: float,
+                           current: float, power: float) -> None:
         """Update or insert a row in the nodes DataTable."""
-        table = self.query_one("#nodes-table", DataTable)
+        table = self._table
         pm = self.gateway._power_manager
-        row_key = f"node_{msg.node_id}"
-
-        # Get target duty
-        if pm and msg.node_id in pm.nodes:
-            target = pm.nodes[msg.node_id].target_duty
-        else:
-            target = msg.duty
+        row_key = f"node_{node_id}"
 
-        # Get responsive status
-        if pm and msg.node_id in pm.nodes:
-            status_icon = "ok" if pm.nodes[msg.node_id].responsive else "STALE"
+        # Target duty and responsive status, from one node lookup
+        ns = pm.nodes.get(node_id) if pm else None
+        if ns is not None:
+            target = ns.target_duty
+            status_icon = "ok" if ns.responsive else "STALE"
         else:
+            target = duty
             status_icon = "ok"
 
-        row_data = [
-            msg.node_id,
-            f"{msg.duty}%",
+        row_data = (
+            node_id,
+            f"{duty}%",
             f"{target}%",
-            f"{msg.voltage:.2f}V",
-            f"{msg.current:.1f}mA",
-            f"{msg.power:.0f}mW",
+            f"{voltage:.2f}V",
+            f"{current:.1f}mA",
+            f"{power:.0f}mW",
             status_icon,
-        ]
+        )
 
-        # Try to update existing row, add if not found
-        if row_key in table.rows:
-            col_keys = list(table.columns.keys())
-            for col_idx, val in enumerate(row_data):
-                table.update_cell(row_key, col_keys[col_idx], val)
+        # Update only the cells that changed; add the row if it's new
+        last = self._last_row.get(row_key)
+        if last == row_data:
+            return
+        self._last_row[row_key] = row_data
+        if last is not None and row_key in table.rows:
+            for col_key, old, val in zip(self._node_col_keys, last, row_data):
+                if old != val:
+                    table.update_cell(row_key, col_key, val)
         else:
             table.add_row(*row_data, key=row_key)
 
@@ -503,46 +590,19 @@ class MeshGatewayApp(App):
         if self.debug_mode:
             lines.append("\n[yellow]DEBUG ON[/yellow]")
 
+        # Static.update re-lays out the sidebar; skip it when nothing changed
+        text = "\n".join(lines)
+        if text == self._last_sidebar:
+            return
         try:
-            self.query_one("#sidebar", Static).update("\n".join(lines))
+            self._sidebar.update(text)
+            self._last_sidebar = text
         except Exception:
             pass
 
     def _show_help(self):
         """Display help text in the log."""
-        help_text = (
-            "[bold]--- Commands ---[/bold]\n"
-            "  node <id>      Switch target (0-9 or ALL)\n"
-            "  ramp / r       Send RAMP to target node\n"
-            "  stop / s       Send STOP to target node\n"
-            "  duty <0-100>   Set duty cycle on target node\n"
-            "  status         Get status from target node\n"
-            "  read           Single sensor reading\n"
-            "  monitor / m    Start continuous monitoring\n"
-            "  raw <cmd>      Send raw command string\n"
-            "\n"
-            "[bold]--- Power Management ---[/bold]\n"
-            "  threshold <mW> Set total power limit\n"
-            "  priority <id>  Set priority node\n"
-            "  threshold off  Disable power management\n"
-            "  priority off   Clear priority node\n"
-            "  power          Show power manager status\n"
-            "\n"
-            "[bold]--- Polling ---[/bold]\n"
-            "  poll <sec>     Start/adjust poll interval\n"
-            "  poll stop      Stop polling\n"
-            "  poll show      Display latest readings\n"
-            "  poll show on   Show poll data in log\n"
-            "  poll show off  Hide poll data from log\n"
-            "\n"
-            "[bold]--- Keys / Misc ---[/bold]\n"
-            "  debug / d      Toggle debug mode (or F2)\n"
-            "  clear / cls    Clear log (or F3)\n"
-            "  Esc            Focus input\n"
-            "  q / quit       Quit"
-        )
-        log = self.query_one("#log", RichLog)
-        log.write(help_text)
+        self._log_buf.append(_HELP_TEXT)
 
     # ---- Actions ----
 
@@ -554,11 +614,12 @@ class MeshGatewayApp(App):
 
     def action_clear_log(self) -> None:
         """Clear the log panel."""
-        self.query_one("#log", RichLog).clear()
+        self._log_buf.clear()
+        self._log_view.clear()
 
     def action_focus_input(self) -> None:
         """Focus the command input."""
-        self.query_one("#cmd-input", Input).focus()
+        self._cmd_input.focus()
 
     def log_message(self, text: str, style: str = ""):
         """Convenience: post a LogMsg."""
@@ -569,10 +630,18 @@ class MeshGatewayApp(App):
         # Signal reconnect loop to stop
         self.gateway.running = False
         if self._ble_thread:
+            # Short deadlines so a slow BLE stack can't hold up exit; BlueZ
+            # drops the link itself once the process is gone.
             try:
                 if self.gateway.client and self.gateway.client.is_connected:
                     f = self._ble_thread.submit(self.gateway.disconnect())
-                    f.result(timeout=3.0)
+                    f.result(timeout=self.TEARDOWN_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                print("BLE disconnect timed out during exit", file=sys.stderr)
             except Exception:
                 pass
-            self._ble_thread.stop()
+            if not self._ble_thread.stop(timeout=self.TEARDOWN_TIMEOUT):
+                print("BLE thread did not stop cleanly during exit", file=sys.stderr)
+        if self.gateway._web_enabled:
+            import db
+            db.flush()
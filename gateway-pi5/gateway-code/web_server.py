@@ -7,53 +7,142 @@ Broadcasts sensor data via WebSocket the instant it arrives from BLE.
 import asyncio
 import json
 import time
+from collections import deque
+from itertools import chain
 from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 
 import db
 from power_manager import PowerManager
 
+try:
+    import orjson  # Optional: C JSON encoder for broadcasts and API responses
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    class _JSONResponse(JSONResponse):
+        """JSONResponse rendered with orjson."""
+
+        def render(self, content) -> bytes:
+            return orjson.dumps(content)
+else:
+    _dumps = json.dumps
+    _JSONResponse = JSONResponse
+
 
 # --- WebSocket Manager ---
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts."""
 
+    SEND_TIMEOUT = 2.0  # Seconds a client may take to accept one message
+
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def broadcast(self, message: dict):
-        """Send JSON message to all connected WebSocket clients."""
+        """Send JSON message to all connected WebSocket clients.
+
+        A client whose send fails or takes longer than SEND_TIMEOUT is
+        dropped and its socket closed (the dashboard reconnects and gets
+        fresh state), so one stalled browser can't hold up the others.
+        """
         if not self.active_connections:
             return
-        data = json.dumps(message)
-        disconnected = []
-        for conn in self.active_connections:
+        data = _dumps(message)
+        # Snapshot: clients may connect/disconnect while we await sends.
+        # Sends run concurrently so one slow socket doesn't hold up the rest.
+        conns = list(self.active_connections)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(conn.send_text(data), self.SEND_TIMEOUT)
+              for conn in conns),
+            return_exceptions=True)
+        dead = {conn for conn, result in zip(conns, results)
+                if isinstance(result, Exception)}
+        if dead:
+            self.active_connections -= dead
+            for conn in dead:
+                asyncio.create_task(self._close(conn))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(websocket.close(), self.SEND_TIMEOUT)
+        except Exception:
+            pass
+
+
+# Broadcasts are queued and sent by one task (_broadcaster), so the
+# gateway's callers never wait on WebSocket writes. When the queue is full
+# the oldest sensor/log message is dropped to keep the dashboard live;
+# state messages (events, node deltas) are only dropped as a last resort.
+BROADCAST_QUEUE_SIZE = 1024
+_DROPPABLE_TYPES = frozenset({"sensor_data", "sensor_batch", "log"})
+_bcast_q: deque = deque()
+_bcast_ready = asyncio.Event()
+
+
+def _enqueue(message: dict):
+    """Queue a message for _broadcaster, evicting one message when full."""
+    if len(_bcast_q) >= BROADCAST_QUEUE_SIZE:
+        _evict_one()
+    _bcast_q.append(message)
+    _bcast_ready.set()
+
+
+def _evict_one():
+    """Drop the oldest droppable message, else the oldest message."""
+    for i, queued in enumerate(_bcast_q):
+        if queued["type"] in _DROPPABLE_TYPES:
+            del _bcast_q[i]
+            return
+    evicted = _bcast_q.popleft()
+    if evicted["type"] == "nodes_delta":
+        # Those fields never reached the clients; forget them so the next
+        # delta for these nodes resends every field
+        for nid in evicted["nodes"]:
+            _last_sent_nodes.pop(nid, None)
+
+
+async def _broadcaster():
+    """Send queued broadcast messages to all clients, one at a time.
+
+    Everything queued when the task wakes is sent as one batch, with a
+    single time.time() stamped on the messages that carry a timestamp.
+    """
+    while True:
+        await _bcast_ready.wait()
+        _bcast_ready.clear()
+        batch = list(_bcast_q)
+        _bcast_q.clear()
+        ts = time.time()
+        for message in batch:
+            if "timestamp" in message:
+                message["timestamp"] = ts
             try:
-                await conn.send_text(data)
+                await manager.broadcast(message)
             except Exception:
-                disconnected.append(conn)
-        for conn in disconnected:
-            if conn in self.active_connections:
-                self.active_connections.remove(conn)
+                pass
 
 
 # --- FastAPI App ---
 
-app = FastAPI(title="DC Monitor Mesh Dashboard")
+app = FastAPI(title="DC Monitor Mesh Dashboard", default_response_class=_JSONResponse)
 manager = ConnectionManager()
 
 # Reference to the gateway (set by gateway.py at startup)
@@ -99,6 +188,20 @@ for _subdir in ["css", "js"]:
 
 
 
+def create_server(port: int):
+    """uvicorn Server for the dashboard, to be awaited with .serve().
+
+    Shared by the TUI and web-only modes. Broadcasts are many small JSON
+    frames sent to every client, so per-message deflate is off: it would
+    compress each frame once per connection for little size benefit.
+    """
+    import uvicorn
+    config = uvicorn.Config(
+        app, host="0.0.0.0", port=port, log_level="info",
+        ws_per_message_deflate=False)
+    return uvicorn.Server(config)
+
+
 # --- WebSocket Endpoint ---
 
 @app.websocket("/ws")
@@ -106,7 +209,7 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         # Send initial state on connect (always, even if gateway not ready)
-        await websocket.send_text(json.dumps({
+        await websocket.send_text(_dumps({
             "type": "state",
             "data": _build_state()
         }))
@@ -116,13 +219,33 @@ async def websocket_endpoint(websocket: WebSocket):
             msg = json.loads(data)
             if msg.get("type") == "command" and _gateway:
                 cmd = msg.get("command", "")
-                asyncio.create_task(_execute_command(cmd))
+                try:
+                    _cmd_q.put_nowait(cmd)
+                except asyncio.QueueFull:
+                    await websocket.send_text(_dumps({
+                        "type": "log",
+                        "text": f"[ERROR] Gateway busy, dropped: {cmd}",
+                        "timestamp": time.time(),
+                    }))
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
         manager.disconnect(websocket)
 
 
+# Dashboard commands run one at a time, in arrival order, on one worker.
+# A full queue rejects new commands instead of piling up tasks.
+COMMAND_QUEUE_SIZE = 64
+_cmd_q: asyncio.Queue = asyncio.Queue(maxsize=COMMAND_QUEUE_SIZE)
+
+
+async def _cmd_worker():
+    """Execute queued dashboard commands sequentially."""
+    while True:
+        cmd = await _cmd_q.get()
+        await _execute_command(cmd)
+
+
 async def _execute_command(cmd: str):
     """Parse and dispatch a user-friendly command (mirrors TUI dispatch logic)."""
     if not _gateway:
@@ -236,6 +359,8 @@ async def _execute_command(cmd: str):
             await _gateway.send_command(cmd)
     except Exception as e:
         await broadcast_log(f"[ERROR] {e}")
+    finally:
+        _invalidate_state()
 
 
 # --- REST API ---
@@ -249,7 +374,7 @@ async def get_state():
 @app.get("/api/history")
 async def get_history(node_id: str = None, minutes: int = 30, limit: int = 500):
     """Return historical sensor readings."""
-    return db.get_history(node_id=node_id, minutes=minutes, limit=limit)
+    return db.to_dicts(db.get_history(node_id=node_id, minutes=minutes, limit=limit))
 
 
 class CommandRequest(BaseModel):
@@ -292,6 +417,7 @@ async def set_poll(settings: PollSettings):
     if not _gateway:
         return {"error": "Gateway not initialized"}
     await _gateway.start_web_poll(settings.interval)
+    _invalidate_state()
     return {"status": "ok", "interval": _gateway._web_poll_interval}
 
 @app.delete("/api/settings/poll")
@@ -300,6 +426,7 @@ async def stop_poll():
     if not _gateway:
         return {"error": "Gateway not initialized"}
     await _gateway.stop_web_poll()
+    _invalidate_state()
     return {"status": "ok"}
 
 
@@ -315,6 +442,7 @@ async def set_threshold(settings: ThresholdSettings):
         _gateway._power_manager = PowerManager(_gateway)
     _gateway._power_manager.set_threshold(settings.threshold_mw)
     asyncio.ensure_future(_gateway._power_manager.poll_loop())
+    _invalidate_state()
     return {"status": "ok", "threshold_mw": settings.threshold_mw}
 
 @app.delete("/api/settings/threshold")
@@ -324,6 +452,7 @@ async def clear_threshold():
         return {"error": "Gateway not initialized"}
     if _gateway._power_manager:
         await _gateway._power_manager.disable()
+    _invalidate_state()
     return {"status": "ok"}
 
 
@@ -338,6 +467,7 @@ async def set_priority(settings: PrioritySettings):
     if not _gateway._power_manager:
         return {"error": "Set a threshold first"}
     _gateway._power_manager.set_priority(settings.node_id)
+    _invalidate_state()
     return {"status": "ok", "priority_node": settings.node_id}
 
 @app.delete("/api/settings/priority")
@@ -347,9 +477,19 @@ async def clear_priority():
         return {"error": "Gateway not initialized"}
     if _gateway._power_manager:
         _gateway._power_manager.clear_priority()
+    _invalidate_state()
     return {"status": "ok"}
 
 
+# --- Background Workers ---
+
+@app.on_event("startup")
+async def _start_workers():
+    """Start the broadcaster (_bcast_q) and dashboard command (_cmd_q) workers."""
+    asyncio.create_task(_broadcaster())
+    asyncio.create_task(_cmd_worker())
+
+
 # --- DB Maintenance ---
 
 @app.on_event("startup")
@@ -367,13 +507,39 @@ async def _start_db_maintenance():
 
 # --- State Builder ---
 
+STATE_CACHE_TTL = 0.25  # Seconds a built state dict is reused
+_state_cache = {"t": 0.0, "v": None}
+
+
+def _invalidate_state():
+    """Drop the cached state so the next _build_state() rebuilds it."""
+    _state_cache["t"] = 0.0
+
+
 def _build_state() -> dict:
+    """Return the current mesh state, rebuilt at most every STATE_CACHE_TTL.
+
+    Several tabs polling /api/state (or connecting at once) share one
+    build. Broadcasts and commands/settings changes invalidate the cache,
+    so a change is never hidden behind it.
+    """
+    now = time.monotonic()
+    if _state_cache["v"] is not None and now - _state_cache["t"] < STATE_CACHE_TTL:
+        return _state_cache["v"]
+    state = _compute_state()
+    _state_cache["t"] = now
+    _state_cache["v"] = state
+    return state
+
+
+def _compute_state() -> dict:
     """Build current mesh state dict from gateway + PM objects."""
     if not _gateway:
         return {"error": "Gateway not initialized"}
 
+    now = time.time()
     state = {
-        "timestamp": time.time(),
+        "timestamp": now,
         "gateway": {
             "connected": _gateway.client is not None and _gateway.client.is_connected,
             "device_name": getattr(_gateway.connected_device, 'name', None),
@@ -389,23 +555,10 @@ def _build_state() -> dict:
             "requested": _gateway._web_poll_requested,
             "interval": _gateway._web_poll_interval,
         },
-        "nodes": {},
+        "nodes": _build_nodes(now=now),
         "sensing_node_count": _gateway.sensing_node_count,
     }
 
-    # Always populate nodes from the gateway's last seen readings
-    for nid, r in getattr(_gateway, '_last_readings', {}).items():
-        state["nodes"][nid] = {
-            "duty": r["duty"],
-            "voltage": r["voltage"],
-            "current": r["current"],
-            "power": r["power"],
-            "last_seen": r["last_seen"],
-            "responsive": time.time() - r["last_seen"] < 30,
-            "commanded_duty": 0,
-            "target_duty": 0,
-        }
-
     pm = _gateway._power_manager
     if pm:
         state["power_manager"] = {
@@ -415,51 +568,135 @@ def _build_state() -> dict:
             "priority_node": pm.priority_node,
             "total_power_mw": sum(ns.power for ns in pm.nodes.values()),
         }
-        # Overlay PM-specific info (targets, responsiveness) onto the known nodes
-        for nid, ns in pm.nodes.items():
-            if nid not in state["nodes"]:
-                state["nodes"][nid] = {}
-            state["nodes"][nid].update({
+
+    return state
+
+
+def _build_nodes(node_ids=None, now: float = None) -> dict:
+    """Per-node dicts for state/deltas; node_ids limits it to a subset.
+
+    One pass over the nodes: PM-tracked nodes report their NodeState
+    (targets, responsiveness), the rest the gateway's last seen reading.
+    """
+    nodes = {}
+    if now is None:
+        now = time.time()
+    cutoff = now - 30  # Readings older than this are not responsive
+
+    readings = getattr(_gateway, '_last_readings', {})
+    pm = _gateway._power_manager
+    pm_nodes = pm.nodes if pm else {}
+    if node_ids is None:
+        node_ids = chain(readings, (nid for nid in pm_nodes if nid not in readings))
+    # NodeState.last_seen is monotonic ns; report it as wall-clock seconds.
+    now_ns = time.monotonic_ns()
+    for nid in node_ids:
+        ns = pm_nodes.get(nid)
+        if ns is not None:
+            nodes[nid] = {
                 "duty": ns.duty,
                 "voltage": ns.voltage,
                 "current": ns.current,
                 "power": ns.power,
+                "last_seen": now - (now_ns - ns.last_seen) / 1e9,
                 "responsive": ns.responsive,
-                "last_seen": ns.last_seen,
                 "commanded_duty": ns.commanded_duty,
                 "target_duty": ns.target_duty,
-            })
+            }
+            continue
+        r = readings.get(nid)
+        if r is None:
+            continue
+        nodes[nid] = {
+            "duty": r["duty"],
+            "voltage": r["voltage"],
+            "current": r["current"],
+            "power": r["power"],
+            "last_seen": r["last_seen"],
+            "responsive": r["last_seen"] > cutoff,
+            "commanded_duty": 0,
+            "target_duty": 0,
+        }
 
-    return state
+    return nodes
 
 
 # --- Broadcast Helpers (called by gateway event hooks) ---
 
 async def broadcast_sensor_data(node_id: str, data: dict, user_triggered: bool = False):
-    """Called by dc_gateway.notification_handler on sensor data."""
-    await manager.broadcast({
+    """Broadcast a single sensor reading (batches use broadcast_sensor_batch)."""
+    _invalidate_state()
+    _enqueue({
         "type": "sensor_data",
         "node_id": node_id,
         "data": data,
-        "timestamp": time.time(),
+        "timestamp": None,  # Stamped by _broadcaster
         "user_triggered": user_triggered,
     })
 
 
+async def broadcast_sensor_batch(batch: list):
+    """Called by the gateway's reading drain task with one tick of readings.
+
+    Each item is (node_id, duty, voltage, current, power, timestamp,
+    user_triggered).
+    """
+    _invalidate_state()
+    _enqueue({
+        "type": "sensor_batch",
+        "readings": [{
+            "node_id": node_id,
+            "data": {
+                "duty": duty, "voltage": voltage,
+                "current": current, "power": power,
+                "last_seen": ts,
+            },
+            "timestamp": ts,
+            "user_triggered": user_triggered,
+        } for node_id, duty, voltage, current, power, ts, user_triggered in batch],
+    })
+
+
+# Last value sent per node field, so deltas only carry fields that changed.
+# last_seen moves on every reading and the dashboard stamps it itself.
+_last_sent_nodes: dict = {}
+
+
+async def broadcast_state_delta(changed_nodes):
+    """Send only the changed fields of the given nodes as a nodes_delta.
+
+    The dashboard merges these into its node cards, so the message size
+    tracks the nodes that changed rather than the whole mesh.
+    """
+    if not _gateway:
+        return
+    delta = {}
+    for nid, fields in _build_nodes(changed_nodes).items():
+        sent = _last_sent_nodes.setdefault(nid, {})
+        diff = {k: v for k, v in fields.items()
+                if k != "last_seen" and sent.get(k) != v}
+        if diff:
+            sent.update(diff)
+            delta[nid] = diff
+    if delta:
+        _enqueue({"type": "nodes_delta", "nodes": delta})
+
+
 async def broadcast_state_change(event: str, details: dict = None):
     """Called on connect, disconnect, failover, PM changes."""
-    await manager.broadcast({
+    _invalidate_state()
+    _enqueue({
         "type": "event",
         "event": event,
         "data": details or {},
-        "timestamp": time.time(),
+        "timestamp": None,  # Stamped by _broadcaster
     })
 
 
 async def broadcast_log(text: str):
     """Called on every gateway log message for console streaming."""
-    await manager.broadcast({
+    _enqueue({
         "type": "log",
         "text": text,
-        "timestamp": time.time(),
+        "timestamp": None,  # Stamped by _broadcaster
     })